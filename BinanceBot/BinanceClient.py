@@ -1,4 +1,3 @@
-from binance.client import Client
 from PyQt5.QtCore import QThread
 
 import pandas as pd
@@ -9,7 +8,18 @@ import numpy as np
 import ta
 
 import time,math,datetime
-
+import atexit
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+try:
+    from _client_common import FastJSONClient, free_balances, book_ticker, kline_arrays, candle_frame
+except ImportError:
+    # imported as BinanceBot.BinanceClient from the project root
+    from ._client_common import FastJSONClient, free_balances, book_ticker, kline_arrays, candle_frame
+
+# per-tick traces go through logging so they are only formatted when enabled
+logger = logging.getLogger(__name__)
 
 class DataLoop(QThread):
 
@@ -18,17 +28,23 @@ class DataLoop(QThread):
         self.parent = parent
         self.client = self.parent.client
         self.last = None
+        self._stop_event = threading.Event()
 
     def __del__(self):
         self.wait()
 
+    def stop(self):
+        """Wake the loop and wait for it to exit"""
+        self._stop_event.set()
+        self.wait()
+
     def run(self):
         print("DataLoop.run()")
 
-        while True:
+        # wait() returns True as soon as stop() is called
+        while not self._stop_event.wait(0.8):
             # print("loop")
 
-            time.sleep(0.8)
             try:
                 self.parent.update()
 
@@ -38,6 +54,15 @@ class DataLoop(QThread):
             # print("end of loop")
 
 
+# seconds before update() refreshes balances even without a new order
+BALANCE_MAX_AGE = 60
+
+# REST requests that overlap with update()'s own, shared by every client so
+# a process running one client per pair does not keep idle threads per pair
+FETCH_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="fetch")
+atexit.register(FETCH_POOL.shutdown)
+
+
 class BinanceClient:
 
     def __init__(self, api_key, api_secret):
@@ -64,6 +89,9 @@ class BinanceClient:
         self.position = -1
 
         self.trade_history = []
+        # Running counts kept by record_trade() so readers never rescan the history
+        self.total_trades = 0
+        self.win_trades = 0
         self.position_open = False
         self.position_data = {}
         self.reset_position()
@@ -81,11 +109,25 @@ class BinanceClient:
         self.plot = False
 
         self.trading_delay = 0.5
-        self.client = Client(self.api_key, self.api_secret)
+        self.client = FastJSONClient(self.api_key, self.api_secret)
         self.update_time = 0
         self.balances = {}
+        # balances only change when this client trades; refetch them after
+        # an order, or once they are BALANCE_MAX_AGE seconds old
+        self._balance_dirty = True
+        self._last_balance_fetch = 0.0
         self.tickers = {}
+        # self.df is only ever rebound to a finished DataFrame, never modified
+        # in place, so readers take one local reference and need no lock
         self.df = pd.DataFrame()
+        # set once update() has populated self.df
+        self.data_ready = threading.Event()
+        # candle arrays kept by update_candles(), per (pair, interval)
+        self._candle_bufs = {}
+        # runs REST requests that can overlap with update()'s own requests
+        self._fetch_pool = FETCH_POOL
+        # order/position logs, opened line buffered on first write
+        self._log_files = {}
 
         self.data_loop = DataLoop(self)
 
@@ -104,35 +146,29 @@ class BinanceClient:
 
         # get account balance
 
-        try:
-            info = self.client.get_account()
-            balance = 0
-            for item in info["balances"]:
-                if item["asset"] == self.base_asset:
-                    self.base_balance = float(item["free"])
-                if item["asset"] == self.asset:
-                    self.asset_balance = float(item["free"])
-        except Exception as e:
-            print(f"cannot get account info from binance: {str(e)}")
-            if hasattr(e, 'response') and hasattr(e.response, 'text'):
-                print(f"Error response: {e.response.text}")
-            if hasattr(e, 'status_code'):
-                print(f"Status code: {e.status_code}")
-            print(f"Using API key: {self.api_key[:8]}...{self.api_key[-8:]}")
-            print("Please check your API key permissions in Binance")
-
-            return
+        if self._balance_dirty or time.time() - self._last_balance_fetch > BALANCE_MAX_AGE:
+            try:
+                info = self.client.get_account()
+            except Exception as e:
+                print(f"cannot get account info from binance: {str(e)}")
+                if hasattr(e, 'response') and hasattr(e.response, 'text'):
+                    print(f"Error response: {e.response.text}")
+                if hasattr(e, 'status_code'):
+                    print(f"Status code: {e.status_code}")
+                print(f"Using API key: {self.api_key[:8]}...{self.api_key[-8:]}")
+                print("Please check your API key permissions in Binance")
+
+                return
+
+            balances = free_balances(info)
+            self.balances = balances
+            self.base_balance = balances.get(self.base_asset, 0.0)
+            self.asset_balance = balances.get(self.asset, 0.0)
+            self._balance_dirty = False
+            self._last_balance_fetch = time.time()
 
         self.update_time = time.time()
 
-        balance = info['balances']
-
-        balances = {}
-        for i in balance:
-            if float(i["free"]) > 0.0:
-                balances[i["asset"]] = float(i["free"])
-        self.balances = balances
-
         # get bid & ask price
 
         try:
@@ -146,11 +182,15 @@ class BinanceClient:
 
 
 
-        for i in tickers:
-            if i["symbol"] == self.pair:
-                self.tickers[self.pair] = {"ask": float(i["askPrice"]), "bid": float(i["bidPrice"])}
+        ticker = book_ticker(tickers, self.pair)
+        if ticker is not None:
+            self.tickers[self.pair] = ticker
 
-        self.df = self.get_candles()
+        new_df = self.get_candles()
+        self.df = new_df
+
+        if new_df is not None and not new_df.empty:
+            self.data_ready.set()
 
     def update_trailstop(self,actual):
         
@@ -161,16 +201,16 @@ class BinanceClient:
             trigger = actual["low"]
         
         if self.position_open and self.trail_stop_enabled:
-            print(" ----------------  update trail stop -----------------")
-            print(" Trigger" + str(trigger) + "  Trail stop:  " + str(self.TS) )
+            logger.debug(" ----------------  update trail stop -----------------")
+            logger.debug(" Trigger %s  Trail stop:  %s", trigger, self.TS)
 
             open_price = self.position_data['buy_price']
             min_trail = open_price * self.min_trail
 
             trail_trigger = (min_trail / self.trail_stop)+open_price
             
-            print("Min trail price: " + str(min_trail+open_price))
-            print("Trail stop trigger price: " + str(trail_trigger))
+            logger.debug("Min trail price: %s", min_trail + open_price)
+            logger.debug("Trail stop trigger price: %s", trail_trigger)
 
 
             #  ----------------------  if trail stop touched ---------------------
@@ -183,7 +223,7 @@ class BinanceClient:
 
                 return True
 
-            print(" Actual high " + str(actual["high"]) + "  Max: " + str(self.max_price))
+            logger.debug(" Actual high %s  Max: %s", actual["high"], self.max_price)
             # -------------------------- if high > max -------------------
             if self.max_price is None or self.max_price < actual["high"]:
 
@@ -192,14 +232,14 @@ class BinanceClient:
                 delta = (self.max_price-open_price)
                 trail_value = ( delta * self.trail_stop)
 
-                print("Trail value: " + str(trail_value) + "   Min trail value: " + str(min_trail))
+                logger.debug("Trail value: %s   Min trail value: %s", trail_value, min_trail)
 
                 if trail_value > min_trail:
                     self.TS = open_price + trail_value
 
                     if self.mode == 'trade':
 
-                        print(" TS value updated:" + str(self.TS))
+                        logger.debug(" TS value updated: %s", self.TS)
                         pass
 
             return False
@@ -243,27 +283,29 @@ class BinanceClient:
         # init iteration data
 
     def data_process(self):
-        print("data_process")
-        pass
+        logger.debug("data_process")
+
+    def _log_file(self, path):
+        f = self._log_files.get(path)
+        if f is None:
+            f = self._log_files[path] = open(path, 'a', buffering=1)
+        return f
 
     def write_order(self, text):
         text += "\n"
-        f = open("order.log", 'a')
-        f.write(text)
-        f.close()
+        self._log_file("order.log").write(text)
 
     def write_position(self, text):
         text = str(text)
         text += "\n"
-        f = open("position.log", 'a')
-        f.write(text)
-        f.close()
+        self._log_file("position.log").write(text)
         
 
     def buy(self):
 
         if self.mode == "trade" :
             self.trade_buy()
+            self._balance_dirty = True
 
         elif self.mode == "backtest":
             self.backtest_buy()
@@ -272,10 +314,16 @@ class BinanceClient:
 
         if self.mode == "trade":
             self.trade_sell()
+            self._balance_dirty = True
 
         elif self.mode == "backtest":
             self.backtest_sell()
 
+    def record_trade(self, trade):
+        self.trade_history.append(trade)
+        self.total_trades += 1
+        self.win_trades += trade.get('profit', 0) > 0
+
     def reset_position(self):
         self.position_data = {
             "start_epoch": None,
@@ -313,10 +361,11 @@ class BinanceClient:
 
             self.position_data["profit"] = round((self.position_data["sell_price"] / self.position_data["buy_price"] ) - 1,5)
 
-            self.trade_history.append(self.position_data)
+            self.record_trade(self.position_data)
 
             self.write_position(self.position_data)
             self.reset_position()
+            self._balance_dirty = True
 
     def trade_buy(self):
 
@@ -349,9 +398,11 @@ class BinanceClient:
 
                     price = busd_amount / qty
 
-                    self.open_position(time.time(),price)
+                    # one clock read for both the position epoch and the log line
+                    now = time.time()
+                    self.open_position(now,price)
                     sell_price_1 = round(price * (1 + tp1), 2)
-                    print(datetime.datetime.now())
+                    print(datetime.datetime.fromtimestamp(now))
                     print("Buy order filled, qty = " + str(qty) + self.asset + " @ " + str(price) + self.base_asset + " TP1 " + str(sell_price_1))
 
 
@@ -411,6 +462,8 @@ class BinanceClient:
 
             self.client.cancel_order(symbol=self.pair,orderId=order_id)
 
+        # Cancelling the TP orders frees the locked quantity; refetch balances
+        self._balance_dirty = True
         self.update()
 
 
@@ -436,9 +489,10 @@ class BinanceClient:
 
                 price = busd_amount / qty
 
-                self.close_position(time.time(),price)
+                now = time.time()
+                self.close_position(now,price)
 
-                print(datetime.datetime.now())
+                print(datetime.datetime.fromtimestamp(now))
                 print("Sell order filled, qty = " + str(qty) + self.asset + " @ " + str(price) + self.base_asset)
 
                 text = "SELL " + str(qty) + " @ " + str(round(price,2))
@@ -539,24 +593,9 @@ class BinanceClient:
 
             candles = self.client.get_historical_klines(self.pair,self.interval ,str(start))
 
-            out = []
-
-            for i in candles:
-                out.append(i[0:6])
-
-            candles = out
-
-            df = pd.DataFrame(candles, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-            df['close'] = pd.to_numeric(df['close'])
-            df['high'] = pd.to_numeric(df['high'])
-            df['low'] = pd.to_numeric(df['low'])
-            df['open'] = pd.to_numeric(df['open'])
-            df['volume'] = pd.to_numeric(df['volume'])
-
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-
-            for i in df.index:
-                df.at[i,'timestamp']= int(df['timestamp'][i].timestamp()*1000000)
+            # build every column with its final dtype in one go;
+            # open time in ms -> epoch seconds
+            df = candle_frame(*kline_arrays(candles))
 
 
             if self.mode == "backtest":
@@ -570,6 +609,49 @@ class BinanceClient:
             print(" cannot download candle data")
             return self.df
 
+    def update_candles(self, interval, length):
+        """Last `length` candles of interval, fetching only the new ones
+
+        Candles are kept per (pair, interval) as NumPy arrays of epoch-second
+        open times and an (n, 5) OHLCV block. After the first full fetch only
+        klines from the last, still forming candle onwards are requested and
+        spliced onto the arrays. If more than `length` candles may have passed
+        since (a stall or outage), the window is fetched in full again.
+        """
+        buf_key = (self.pair, interval)
+        buf = self._candle_bufs.get(buf_key)
+
+        if buf is not None:
+            opens = buf[0]
+            step = opens[-1] - opens[-2] if len(opens) > 1 else 0
+            # candles since the last open, counting the one still forming
+            if step <= 0 or (time.time() - opens[-1]) / step + 1 >= length:
+                buf = None
+
+        try:
+            if buf is not None:
+                klines = self.client.get_klines(symbol=self.pair, interval=interval,
+                                                startTime=int(buf[0][-1]) * 1000, limit=length)
+                # A full batch may stop short of now; the newest candles need a plain fetch
+                if len(klines) >= length:
+                    buf = None
+            if buf is None:
+                klines = self.client.get_klines(symbol=self.pair, interval=interval, limit=length)
+        except Exception as e:
+            print(f"cannot download {interval} candle data: {str(e)}")
+            cached = self._candle_bufs.get(buf_key)
+            return None if cached is None else candle_frame(*cached)
+
+        timestamps, ohlcv = kline_arrays(klines)
+        if buf is not None:
+            # replace the re-fetched candles, keep the older ones
+            older = buf[0] < timestamps[0] if len(timestamps) else slice(None)
+            timestamps = np.concatenate((buf[0][older], timestamps))[-length:]
+            ohlcv = np.concatenate((buf[1][older], ohlcv))[-length:]
+        self._candle_bufs[buf_key] = (timestamps, ohlcv)
+
+        return candle_frame(timestamps, ohlcv)
+
     def manager(self):
         pass
 
@@ -0,0 +1,81 @@
+"""
+_backtest.py - Parameter sweeps of the SMA crossover / RSI strategy
+
+backtest_grid_nb runs every (fast SMA, slow SMA, RSI buy, RSI sell)
+combination on its own core via Numba's prange; backtest_grid prepares
+the inputs and returns the final equities as a 4-D array.
+"""
+
+import numpy as np
+
+try:
+    from _njit import njit, prange
+    from _indicators import rolling_mean_tail, rsi_nb
+except ImportError:
+    from ._njit import njit, prange
+    from ._indicators import rolling_mean_tail, rsi_nb
+
+
+@njit(cache=True)
+def _sma_rows(close, windows):
+    """One SMA row per window, NaN before each window is filled"""
+    out = np.full((len(windows), len(close)), np.nan)
+    for w in range(len(windows)):
+        rolling_mean_tail(close, out[w], 0, windows[w])
+    return out
+
+
+@njit(parallel=True, cache=True)
+def backtest_grid_nb(close, rsi, fast_sma, slow_sma, buys, sells, out_equity):
+    """Fill out_equity with the final equity of each parameter combination
+
+    Signals follow StandaloneClient.analyse_data: a crossover of the fast
+    SMA over the slow SMA takes precedence, otherwise RSI below the buy
+    level buys and RSI above the sell level sells. Long only, starting
+    from an equity of 1000, one unit per trade. Combination k is
+    (fast, slow, buy, sell) in row-major order.
+    """
+    n = len(close)
+    n_slow, n_buy, n_sell = slow_sma.shape[0], len(buys), len(sells)
+    for k in prange(len(out_equity)):
+        f = k // (n_slow * n_buy * n_sell)
+        s = k // (n_buy * n_sell) % n_slow
+        b = k // n_sell % n_buy
+        q = k % n_sell
+        fast = fast_sma[f]
+        slow = slow_sma[s]
+
+        equity = 1000.0
+        entry = 0.0
+        in_position = False
+        for i in range(1, n):
+            bullish = fast[i] > slow[i] and fast[i - 1] <= slow[i - 1]
+            bearish = fast[i] < slow[i] and fast[i - 1] >= slow[i - 1]
+            buy = bullish or (not bearish and rsi[i] < buys[b])
+            sell = bearish or (not bullish and rsi[i] > sells[q])
+            if not in_position and buy:
+                entry = close[i]
+                in_position = True
+            elif in_position and sell:
+                equity += close[i] - entry
+                in_position = False
+        out_equity[k] = equity
+
+
+def backtest_grid(close, sma_fast_range, sma_slow_range, rsi_buy_range, rsi_sell_range):
+    """Final equity for every parameter combination
+
+    Returns an array of shape (fast, slow, rsi_buy, rsi_sell) indexed like
+    the given ranges.
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    fasts = np.asarray(sma_fast_range, dtype=np.int64)
+    slows = np.asarray(sma_slow_range, dtype=np.int64)
+    buys = np.asarray(rsi_buy_range, dtype=np.float64)
+    sells = np.asarray(rsi_sell_range, dtype=np.float64)
+
+    shape = (len(fasts), len(slows), len(buys), len(sells))
+    out = np.empty(int(np.prod(shape)))
+    backtest_grid_nb(close, rsi_nb(close), _sma_rows(close, fasts), _sma_rows(close, slows),
+                     buys, sells, out)
+    return out.reshape(shape)
@@ -0,0 +1,67 @@
+"""
+_client_common.py - Response parsing shared by the Binance clients
+
+BinanceClient and the standalone client poll the same REST endpoints;
+these helpers turn the responses into the dicts both clients keep.
+"""
+
+import numpy as np
+import pandas as pd
+from binance.client import Client
+from binance.exceptions import BinanceAPIException, BinanceRequestException
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONClient(Client):
+    """python-binance Client decoding REST responses with orjson when installed"""
+
+    @staticmethod
+    def _handle_response(response):
+        if orjson is None:
+            return Client._handle_response(response)
+        if not (200 <= response.status_code < 300):
+            raise BinanceAPIException(response, response.status_code, response.text)
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            raise BinanceRequestException('Invalid Response: %s' % response.text)
+
+
+def kline_arrays(klines):
+    """Open times in epoch seconds and an (n, 5) float64 OHLCV block from raw klines"""
+    arr = np.array([k[0:6] for k in klines], dtype=object).reshape(-1, 6)
+    return arr[:, 0].astype(np.int64) // 1000, arr[:, 1:6].astype(np.float64)
+
+
+def candle_frame(timestamps, ohlcv):
+    """Candle DataFrame (timestamp, open, high, low, close, volume) from kline_arrays output"""
+    return pd.DataFrame({
+        'timestamp': timestamps,
+        'open': ohlcv[:, 0],
+        'high': ohlcv[:, 1],
+        'low': ohlcv[:, 2],
+        'close': ohlcv[:, 3],
+        'volume': ohlcv[:, 4]
+    })
+
+
+def free_balances(account):
+    """Map asset -> free balance for every asset with a positive free amount"""
+    balances = {}
+    for i in account['balances']:
+        free = float(i["free"])
+        if free > 0.0:
+            balances[i["asset"]] = free
+    return balances
+
+
+def book_ticker(tickers, pair):
+    """Best ask & bid of pair from get_orderbook_tickers(), or None if missing"""
+    for i in tickers:
+        if i["symbol"] == pair:
+            return {"ask": float(i["askPrice"]), "bid": float(i["bidPrice"])}
+    return None
@@ -0,0 +1,363 @@
+"""
+_ict.py - ICT market-structure kernels on NumPy arrays
+
+Shared by the ICT strategy clients (trade.py, ict_strategy.py and
+enhanced_ict_strategy.py). Each function replaces a per-candle loop over
+DataFrame rows with whole-array operations; swing and liquidity-sweep
+detection are single loops JIT-compiled with Numba when it is available
+(see _njit.py), with NumPy versions used otherwise.
+"""
+
+import numpy as np
+
+try:
+    from _njit import njit, NUMBA_AVAILABLE
+except ImportError:
+    from ._njit import njit, NUMBA_AVAILABLE
+
+
+@njit(cache=True)
+def _trailing_extreme(x, window, sign, out):
+    """out[j] = max (sign 1) or min (sign -1) of x[j - window + 1:j + 1]
+
+    Uses a monotonic deque of indices held in a plain array, so every
+    element is pushed and popped at most once.
+    """
+    deque = np.empty(len(x), dtype=np.int64)
+    head = 0
+    tail = 0
+    for j in range(len(x)):
+        while tail > head and sign * x[deque[tail - 1]] <= sign * x[j]:
+            tail -= 1
+        deque[tail] = j
+        tail += 1
+        if deque[head] <= j - window:
+            head += 1
+        out[j] = x[deque[head]]
+
+
+@njit(cache=True)
+def swing_points_nb(high, low, window, swing_high, swing_low):
+    """Fill the swing masks; see swing_points"""
+    n = len(high)
+    high_max = np.empty(n)
+    low_min = np.empty(n)
+    _trailing_extreme(high, window, 1.0, high_max)
+    _trailing_extreme(low, window, -1.0, low_min)
+    # high_max[i - 1] covers the window bars before i, high_max[i + window] those after
+    for i in range(window, n - window):
+        swing_high[i] = high[i] > high_max[i - 1] and high[i] > high_max[i + window]
+        swing_low[i] = low[i] < low_min[i - 1] and low[i] < low_min[i + window]
+
+
+def swing_points(high, low, window=5):
+    """Boolean swing-high and swing-low masks
+
+    Bar i is a swing high when its high is strictly above the highs of the
+    window bars on each side, and a swing low when its low is strictly
+    below their lows. The first and last window bars are never swings.
+    """
+    n = len(high)
+    swing_high = np.zeros(n, dtype=bool)
+    swing_low = np.zeros(n, dtype=bool)
+    if n < 2 * window + 1:
+        return swing_high, swing_low
+    high = np.ascontiguousarray(high, dtype=np.float64)
+    low = np.ascontiguousarray(low, dtype=np.float64)
+    if NUMBA_AVAILABLE:
+        swing_points_nb(high, low, window, swing_high, swing_low)
+    else:
+        # Without Numba the kernel would run as a Python loop; compare each
+        # bar with its neighbourhood through sliding windows instead
+        swing_high[window:n - window] = _strict_extreme(high, window)
+        swing_low[window:n - window] = _strict_extreme(-low, window)
+    return swing_high, swing_low
+
+
+def _strict_extreme(x, window):
+    """Whether the centre of each 2*window+1 window of x is strictly above the rest"""
+    windows = np.lib.stride_tricks.sliding_window_view(x, 2 * window + 1)
+    centre = windows[:, window]
+    left = windows[:, :window].max(axis=1)
+    right = windows[:, window + 1:].max(axis=1)
+    return (centre > left) & (centre > right)
+
+
+class SwingTracker:
+    """swing_points for a rolling candle window, rescanning only the tail
+
+    A bar's swing flags depend only on the window bars either side of it.
+    When the new candles are the previous ones shifted by a few bars, with
+    just the last (still forming) candles changed, the flags of every bar
+    whose neighbourhood is unchanged are copied from the previous call and
+    only the trailing bars are scanned again.
+    """
+
+    def __init__(self, window=5):
+        self.window = window
+        self._last = None
+
+    def _matching_prefix(self, timestamps, high, low):
+        """(k, shift): bars [0, k) equal the previous bars [shift, shift + k)"""
+        prev_ts, prev_high, prev_low = self._last[:3]
+        if len(timestamps) == 0 or len(prev_ts) == 0:
+            return 0, 0
+        shift = int(np.searchsorted(prev_ts, timestamps[0]))
+        if shift >= len(prev_ts) or prev_ts[shift] != timestamps[0]:
+            return 0, 0
+        m = min(len(prev_ts) - shift, len(timestamps))
+        same = ((prev_ts[shift:shift + m] == timestamps[:m])
+                & (prev_high[shift:shift + m] == high[:m])
+                & (prev_low[shift:shift + m] == low[:m]))
+        return (m if same.all() else int(np.argmin(same))), shift
+
+    def update(self, timestamps, high, low):
+        """Swing-high and swing-low masks of the candles; see swing_points"""
+        timestamps = np.asarray(timestamps)
+        high = np.ascontiguousarray(high, dtype=np.float64)
+        low = np.ascontiguousarray(low, dtype=np.float64)
+        w = self.window
+        swing_high = np.zeros(len(high), dtype=bool)
+        swing_low = np.zeros(len(high), dtype=bool)
+
+        start = 0
+        if self._last is not None:
+            k, shift = self._matching_prefix(timestamps, high, low)
+            if k > 2 * w:
+                # bars w..k-w-1 see only unchanged candles on both sides
+                prev_high, prev_low = self._last[3:]
+                swing_high[w:k - w] = prev_high[w + shift:k - w + shift]
+                swing_low[w:k - w] = prev_low[w + shift:k - w + shift]
+                start = k - 2 * w
+
+        tail_high, tail_low = swing_points(high[start:], low[start:], w)
+        swing_high[start + w:] = tail_high[w:]
+        swing_low[start + w:] = tail_low[w:]
+
+        self._last = (timestamps.copy(), high.copy(), low.copy(), swing_high, swing_low)
+        return swing_high, swing_low
+
+
+@njit(cache=True)
+def liquidity_sweeps_nb(open_, high, low, close, lookback, recent):
+    """Single-pass liquidity_sweeps"""
+    n = len(low)
+    range_low = np.inf
+    range_high = -np.inf
+    for i in range(n - lookback, n - recent):
+        range_low = min(range_low, low[i])
+        range_high = max(range_high, high[i])
+    swept_low = False
+    swept_high = False
+    for i in range(n - recent, n):
+        swept_low |= low[i] < range_low * 0.999
+        swept_high |= high[i] > range_high * 1.001
+    bullish = swept_low and close[n - 1] > open_[n - 1]
+    bearish = swept_high and close[n - 1] < open_[n - 1]
+    return bullish, range_low, bearish, range_high
+
+
+def liquidity_sweeps(open_, high, low, close, lookback=20, recent=5):
+    """Sweeps of the prior range by the last `recent` candles
+
+    The range is the lowest low / highest high of bars [-lookback, -recent).
+    Returns (bullish, range_low, bearish, range_high): bullish when a recent
+    low trades 0.1% below range_low and the last candle closes up, bearish
+    when a recent high trades 0.1% above range_high and it closes down.
+    """
+    if NUMBA_AVAILABLE:
+        # Only the last lookback bars are read, as contiguous float64 arrays
+        tail = [np.ascontiguousarray(a[-lookback:], dtype=np.float64) for a in (open_, high, low, close)]
+        return liquidity_sweeps_nb(*tail, lookback, recent)
+    range_low = low[-lookback:-recent].min()
+    range_high = high[-lookback:-recent].max()
+    bullish = bool((low[-recent:] < range_low * 0.999).any()) and close[-1] > open_[-1]
+    bearish = bool((high[-recent:] > range_high * 1.001).any()) and close[-1] < open_[-1]
+    return bullish, range_low, bearish, range_high
+
+
+def fair_value_gaps(open_, high, low, close, bullish, min_body=0.001):
+    """Every bullish or bearish fair value gap in the candles
+
+    Candles i, i + 1 and i + 2 leave a gap when candle i + 1 is a
+    displacement candle whose body, relative to its open, exceeds min_body
+    in the gap direction. A bullish gap spans high[i] to low[i + 2], a
+    bearish gap high[i + 2] to low[i]. Returns (start, top, bottom, size)
+    arrays, where start is i and size is relative to candle i's edge.
+    """
+    body = (close[1:-1] - open_[1:-1]) / open_[1:-1]
+    if bullish:
+        top, bottom = low[2:], high[:-2]
+        found = (body > min_body) & (top > bottom)
+        size = (top - bottom) / bottom
+    else:
+        top, bottom = low[:-2], high[2:]
+        found = (-body > min_body) & (bottom < top)
+        size = (top - bottom) / top
+    start = np.flatnonzero(found)
+    return start, top[start], bottom[start], size[start]
+
+
+class FVGTable:
+    """Active fair value gaps stored column-wise, one NumPy array per field
+
+    is_bull, top, bottom, size, age and created_at are views of the first
+    len(table) rows of preallocated buffers that double when full, so the
+    strategies can update and test all gaps with array operations.
+    Iterating yields the dicts the strategies used to keep (type, top,
+    bottom, mid, size, age, created_at, filled), and `created_at in table`
+    is a set lookup.
+    """
+
+    _FIELDS = (('is_bull', bool), ('top', np.float64), ('bottom', np.float64),
+               ('size', np.float64), ('age', np.int64), ('created_at', object))
+
+    def __init__(self, capacity=256):
+        self._n = 0
+        self._created = set()
+        self._buffers = {name: np.zeros(capacity, dtype=dtype) for name, dtype in self._FIELDS}
+        self._refresh_views()
+
+    def _refresh_views(self):
+        for name, buffer in self._buffers.items():
+            setattr(self, name, buffer[:self._n])
+
+    @property
+    def mid(self):
+        return (self.top + self.bottom) / 2
+
+    def __len__(self):
+        return self._n
+
+    def __contains__(self, created_at):
+        return created_at in self._created
+
+    def __iter__(self):
+        for i in range(self._n):
+            yield self.row(i)
+
+    def row(self, i):
+        """Gap i as a dict"""
+        top, bottom = self.top[i], self.bottom[i]
+        return {
+            'type': 'bullish' if self.is_bull[i] else 'bearish',
+            'top': top,
+            'bottom': bottom,
+            'mid': (top + bottom) / 2,
+            'size': self.size[i],
+            'age': int(self.age[i]),
+            'created_at': self.created_at[i],
+            'filled': False
+        }
+
+    def _reserve(self, rows):
+        """Grow the buffers until `rows` more gaps fit"""
+        capacity = len(self._buffers['top'])
+        if self._n + rows <= capacity:
+            return
+        while capacity < self._n + rows:
+            capacity *= 2
+        for name, buffer in self._buffers.items():
+            grown = np.zeros(capacity, dtype=buffer.dtype)
+            grown[:self._n] = buffer[:self._n]
+            self._buffers[name] = grown
+
+    def append(self, bullish, top, bottom, size, created_at):
+        """Add a new gap with age 0"""
+        self._reserve(1)
+        row = self._n
+        values = (bullish, top, bottom, size, 0, created_at)
+        for (name, _), value in zip(self._FIELDS, values):
+            self._buffers[name][row] = value
+        self._n += 1
+        self._created.add(created_at)
+        self._refresh_views()
+
+    def extend(self, bullish, top, bottom, size, created_at):
+        """Add several new gaps with age 0, one array per field"""
+        rows = len(top)
+        self._reserve(rows)
+        values = (bullish, top, bottom, size, 0, created_at)
+        for (name, _), value in zip(self._FIELDS, values):
+            self._buffers[name][self._n:self._n + rows] = value
+        self._n += rows
+        self._created.update(created_at)
+        self._refresh_views()
+
+    def keep(self, mask):
+        """Drop every gap whose entry in the boolean mask is False"""
+        mask = np.asarray(mask, dtype=bool)
+        # Creation times are unique, so only the dropped ones leave the set
+        self._created.difference_update(self._buffers['created_at'][:self._n][~mask])
+        kept = int(np.count_nonzero(mask))
+        for name, buffer in self._buffers.items():
+            buffer[:kept] = buffer[:self._n][mask]
+        self._n = kept
+        self._refresh_views()
+
+    def remove(self, i):
+        """Drop gap i"""
+        mask = np.ones(self._n, dtype=bool)
+        mask[i] = False
+        self.keep(mask)
+
+
+# market_structure label indexed by (bullish << 1) | bearish
+_STRUCTURE = ('neutral', 'bearish', 'bullish')
+
+
+def market_structure(high, low, close, swing_high, swing_low):
+    """'bullish', 'bearish' or 'neutral' from the last four swing points
+
+    Bullish when the last two of them that are swing highs (positions -2
+    and -4) make a higher high, bearish when they are swing lows making a
+    lower low. With fewer than four swings, falls back to the SMA20/SMA50
+    relationship and the SMA20 slope on the last bar.
+    """
+    highs = np.flatnonzero(swing_high)
+    lows = np.flatnonzero(swing_low)
+
+    if len(highs) + len(lows) < 4:
+        # Not enough swing points, use SMA slope as fallback
+        if len(close) < 50:
+            return 'neutral'
+        sma50 = close[-50:].mean()
+        sma20 = close[-20:].mean()
+        sma20_prev = close[-21:-1].mean()
+        if sma20 > sma50 and sma20 > sma20_prev:
+            return 'bullish'
+        elif sma20 < sma50 and sma20 < sma20_prev:
+            return 'bearish'
+        return 'neutral'
+
+    # Last four swings in candle order (a bar that is both lists its high
+    # first); they are among the last four of each kind
+    highs = highs[-4:]
+    lows = lows[-4:]
+    positions = np.concatenate((highs, lows))
+    is_high = np.concatenate((np.ones(len(highs), dtype=bool), np.zeros(len(lows), dtype=bool)))
+    values = np.concatenate((high[highs], low[lows]))
+    last4 = np.argsort(positions, kind='stable')[-4:]
+    is_high = is_high[last4]
+    values = values[last4]
+
+    # Higher high (bullish) or lower low (bearish) between swings -4 and -2
+    bullish = is_high[-2] & is_high[-4] & (values[-2] > values[-4])
+    bearish = ~is_high[-2] & ~is_high[-4] & (values[-2] < values[-4])
+    return _STRUCTURE[(int(bullish) << 1) | int(bearish)]
+
+
+def _warmup():
+    """Compile the Numba kernels, or load them from the on-disk cache"""
+    x = np.linspace(1.0, 2.0, 16)
+    readonly = x.copy()
+    readonly.flags.writeable = False
+    # Columns from DataFrame.to_numpy() are read-only, a separate specialization
+    for a in (x, readonly):
+        swing_points_nb(a, a, 2, np.zeros(16, dtype=bool), np.zeros(16, dtype=bool))
+        liquidity_sweeps_nb(a, a, a, a, 10, 5)
+
+
+# Pay the compile cost at import so the first live update does not stall
+if NUMBA_AVAILABLE:
+    _warmup()
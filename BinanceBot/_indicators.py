@@ -0,0 +1,94 @@
+"""
+_indicators.py - SMA and RSI kernels on NumPy arrays
+
+The kernels loop over raw float64 arrays and are JIT-compiled with Numba
+when it is available (see _njit.py). The *_tail functions fill only part
+of an output array so callers can extend previously computed values.
+"""
+
+import numpy as np
+
+try:
+    from _njit import njit
+except ImportError:
+    from ._njit import njit
+
+
+@njit(cache=True)
+def rolling_mean_tail(close, out, start, window):
+    """Fill out[start:] with the rolling mean of close, using a running sum"""
+    first = max(start, window - 1)
+    if first >= len(close):
+        return
+    total = close[first - window + 1:first + 1].sum()
+    out[first] = total / window
+    for j in range(first + 1, len(close)):
+        total += close[j] - close[j - window]
+        out[j] = total / window
+
+
+@njit(cache=True)
+def rsi_tail(close, out, start, stop, avg_gain, avg_loss, count, window=14):
+    """Fill out[start:stop] with Wilder's RSI continuing from the given smoothing state
+
+    Matches ta.momentum.rsi when started from an empty state at bar 0.
+    Returns the (avg_gain, avg_loss, count) state after bar stop - 1.
+    """
+    for j in range(start, stop):
+        delta = close[j] - close[j - 1] if j > 0 else 0.0
+        avg_gain = (avg_gain * (window - 1) + max(delta, 0.0)) / window
+        avg_loss = (avg_loss * (window - 1) + max(-delta, 0.0)) / window
+        count += 1
+        if count >= window:
+            out[j] = 100.0 if avg_loss == 0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    return avg_gain, avg_loss, count
+
+
+@njit(cache=True)
+def indicators_tail(close, sma_20, sma_50, rsi, start, avg_gain, avg_loss, count):
+    """Fill sma_20, sma_50 and rsi from bar start onwards in one pass over close
+
+    Same results as rolling_mean_tail (20 and 50) plus rsi_tail (14), with
+    the running sums and RSI smoothing state kept in local variables.
+    Returns the RSI state after bar len(close) - 2, the last closed candle.
+    """
+    n = len(close)
+    sum_20 = close[max(start - 20, 0):start].sum()
+    sum_50 = close[max(start - 50, 0):start].sum()
+    state = (avg_gain, avg_loss, count)
+    for j in range(start, n):
+        c = close[j]
+        sum_20 += c
+        sum_50 += c
+        if j >= 20:
+            sum_20 -= close[j - 20]
+        if j >= 50:
+            sum_50 -= close[j - 50]
+        if j >= 19:
+            sma_20[j] = sum_20 / 20
+        if j >= 49:
+            sma_50[j] = sum_50 / 50
+
+        delta = c - close[j - 1] if j > 0 else 0.0
+        avg_gain = (avg_gain * 13 + max(delta, 0.0)) / 14
+        avg_loss = (avg_loss * 13 + max(-delta, 0.0)) / 14
+        count += 1
+        if count >= 14:
+            rsi[j] = 100.0 if avg_loss == 0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        if j == n - 2:
+            state = (avg_gain, avg_loss, count)
+    return state
+
+
+def sma_nb(close, window):
+    """Simple moving average of close, NaN for the first window - 1 bars"""
+    out = np.full(len(close), np.nan)
+    rolling_mean_tail(close, out, 0, window)
+    return out
+
+
+def rsi_nb(close, window=14):
+    """Wilder's RSI of close, matching ta.momentum.rsi"""
+    out = np.full(len(close), np.nan)
+    rsi_tail(close, out, 0, len(close), 0.0, 0.0, 0, window)
+    return out
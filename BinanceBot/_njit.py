@@ -0,0 +1,23 @@
+"""
+_njit.py - Optional Numba JIT decorator
+
+njit compiles the decorated function with Numba when it is installed and
+otherwise returns it unchanged, so callers fall back to plain Python/NumPy.
+prange falls back to range the same way.
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit, usable with or without arguments"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
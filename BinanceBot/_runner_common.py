@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+_runner_common.py - Helpers shared by the bot and dashboard runner scripts
+
+Buffered/queued logging setup, signal handling, REST socket tuning and
+timestamp formatting used by run.py and the individual run_*.py scripts.
+"""
+
+import sys
+import os
+import time
+import logging
+import logging.handlers
+import queue
+import atexit
+import hashlib
+import hmac
+
+
+# SHA-256 digests of the placeholder API key and secret
+_DEFAULT_KEY_HASHES = (
+    bytes.fromhex('358b5f6606b3fb8e6aaed3d7b3cda482bbf3201965d2e6e45ffcb40b4852a36b'),
+    bytes.fromhex('a9e47039323a3f2c26170d045e7eec7880baee8a042208b0dfc2d14c71059b48'),
+)
+
+# Shared formatter; asctime is rendered without the millisecond suffix
+LOG_FORMATTER = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
+LOG_FORMATTER.default_msec_format = None
+
+# Set once setup_logging has created the log directory
+_LOG_DIR_READY = False
+
+# Logger that StdoutTee sends printed lines to; these records go to the log
+# file only, since the console already got the print itself
+STDOUT_LOGGER = "stdout"
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """FileHandler with a 1 MiB write buffer, flushed only on errors and close"""
+    
+    buffer_size = 1 << 20
+    
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=self.buffer_size,
+                    encoding=self.encoding, errors=self.errors)
+    
+    def emit(self, record):
+        if self.stream is None:
+            self.stream = self._open()
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= logging.ERROR:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+
+class StdoutTee:
+    """sys.stdout stand-in that echoes to the console and logs each printed line"""
+    
+    def __init__(self, stream):
+        self._stream = stream
+        self._logger = logging.getLogger(STDOUT_LOGGER)
+        self._partial = ''
+    
+    def write(self, text):
+        self._stream.write(text)
+        lines = (self._partial + text).split('\n')
+        self._partial = lines.pop()
+        for line in lines:
+            if line:
+                self._logger.info(line)
+        return len(text)
+    
+    def flush(self):
+        self._stream.flush()
+    
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+class PinnedQueueListener(logging.handlers.QueueListener):
+    """QueueListener whose thread pins itself to `cpus` before serving records"""
+    
+    def __init__(self, queue, *handlers, cpus, **kwargs):
+        super().__init__(queue, *handlers, **kwargs)
+        self.cpus = cpus
+    
+    def _monitor(self):
+        pin_to_cpus(self.cpus)
+        super()._monitor()
+
+
+def uses_default_keys(api_key, api_secret):
+    """Return True if either credential is still a placeholder value"""
+    for value in (api_key, api_secret):
+        digest = hashlib.sha256((value or '').encode()).digest()
+        if any(hmac.compare_digest(digest, default) for default in _DEFAULT_KEY_HASHES):
+            return True
+    return False
+
+
+def pin_to_cpus(cpus):
+    """Pin the calling thread to the given CPUs; returns False where unsupported"""
+    try:
+        os.sched_setaffinity(0, cpus)
+    except (AttributeError, OSError):
+        return False
+    return True
+
+
+def handle_sigterm(signum, frame):
+    """Turn SIGTERM into a normal exit so the atexit log flush runs"""
+    sys.exit(0)
+
+
+def tune_sockets(trader):
+    """Mount a keep-alive connection pool with TCP_NODELAY on the trader's REST session"""
+    import socket
+    from requests.adapters import HTTPAdapter
+    from urllib3.connection import HTTPConnection
+    
+    class NoDelayAdapter(HTTPAdapter):
+        def init_poolmanager(self, *args, **kwargs):
+            kwargs['socket_options'] = HTTPConnection.default_socket_options + [
+                (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+                (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+            ]
+            super().init_poolmanager(*args, **kwargs)
+    
+    session = getattr(trader, 'session', None) or getattr(trader.client, 'session', None)
+    if session is None:
+        return
+    session.mount('https://', NoDelayAdapter(pool_connections=4, pool_maxsize=16))
+
+
+def setup_logging(log_name="binance_bot.log", tee_stdout=False, log_cpu=None):
+    """Configure logging for the bot
+
+    With tee_stdout, print() output (e.g. from the strategy clients) is also
+    written to the log file. With log_cpu, the log listener thread is pinned
+    to that CPU.
+    """
+    global _LOG_DIR_READY
+    log_path = "logs"
+    
+    # Ensure log directory exists (once per process)
+    if not _LOG_DIR_READY:
+        os.makedirs(log_path, exist_ok=True)
+        _LOG_DIR_READY = True
+    
+    # Set up logging
+    log_file = os.path.join(log_path, log_name)
+    # Skip the per-record caller lookup and thread/process bookkeeping
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging._srcfile = None
+    
+    # Records are batched in memory (flushed every 256 records or on errors)
+    # and then written through a large file buffer
+    file_handler = BufferedFileHandler(log_file)
+    file_handler.setFormatter(LOG_FORMATTER)
+    buffer_handler = logging.handlers.MemoryHandler(
+        capacity=256, flushLevel=logging.ERROR, target=file_handler
+    )
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(LOG_FORMATTER)
+    # Printed lines already reached the console
+    stream_handler.addFilter(lambda record: record.name != STDOUT_LOGGER)
+    
+    # The trading thread only enqueues records; a listener thread does the I/O
+    log_queue = queue.Queue(-1)
+    if log_cpu is None:
+        listener = logging.handlers.QueueListener(
+            log_queue, buffer_handler, stream_handler, respect_handler_level=True
+        )
+    else:
+        listener = PinnedQueueListener(
+            log_queue, buffer_handler, stream_handler, cpus={log_cpu},
+            respect_handler_level=True
+        )
+    listener.start()
+    
+    def flush_logging():
+        """Stop the listener, drain the memory buffer and close the log file"""
+        if isinstance(sys.stdout, StdoutTee):
+            sys.stdout = sys.stdout._stream
+        listener.stop()
+        buffer_handler.close()
+        file_handler.close()
+    
+    # Single exit hook; SIGTERM and Ctrl-C both exit through atexit
+    atexit.register(flush_logging)
+    
+    # The listener's handlers do the real formatting; the queue handler must
+    # pass the bare message through or every line gets a second prefix
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(message)s",
+        handlers=[logging.handlers.QueueHandler(log_queue)]
+    )
+    if tee_stdout:
+        sys.stdout = StdoutTee(sys.stdout)
+    return logging.getLogger(__name__)
+
+
+# [epoch second, formatted timestamp] of the last now_str() call
+_ts_cache = [0, '']
+
+
+def now_str():
+    """Return the local time as 'YYYY-mm-dd HH:MM:SS', formatted at most once per second"""
+    now = int(time.time())
+    if now != _ts_cache[0]:
+        _ts_cache[0] = now
+        _ts_cache[1] = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now))
+    return _ts_cache[1]
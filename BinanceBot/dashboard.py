@@ -14,7 +14,8 @@ import datetime
 import json
 import logging
 import threading
-from flask import Flask, render_template, jsonify, request, send_from_directory, render_template_string
+from dataclasses import dataclass, asdict
+from flask import Flask, Response, render_template, jsonify, request, send_from_directory, render_template_string
 
 # Create necessary directories
 os.makedirs('logs', exist_ok=True)
@@ -53,6 +54,67 @@ bot_status = {
 # Dictionary to store status for each trading pair
 pair_status = {}
 
+
+@dataclass(frozen=True)
+class BotStatus:
+    """Immutable snapshot of bot_status served to the dashboard"""
+    __slots__ = ('is_running', 'strategy', 'pairs', 'total_value', 'total_trades',
+                 'win_rate', 'active_positions', 'daily_bias', 'last_update')
+    is_running: bool
+    strategy: str
+    pairs: tuple
+    total_value: float
+    total_trades: int
+    win_rate: float
+    active_positions: int
+    daily_bias: str
+    last_update: str
+    
+    @classmethod
+    def from_dict(cls, status):
+        """Build a snapshot from a bot_status dictionary"""
+        values = {name: status.get(name) for name in cls.__slots__}
+        values['pairs'] = tuple(status.get('pairs', ()))
+        return cls(**values)
+    
+    def to_dict(self):
+        """Return the snapshot as a JSON-serializable dictionary"""
+        return asdict(self)
+
+
+# Published snapshots for the read path. Writers update bot_status/pair_status
+# and call publish_status(), which swaps in new snapshots with a single
+# assignment, so request handlers never read a dictionary being mutated.
+bot_status_ref = [BotStatus.from_dict(bot_status)]
+pair_status_ref = [{}]
+
+# Bumped on every publish; /api/stream waits on it to push updates to clients
+status_changed = threading.Condition()
+status_version = [0]
+
+# Distinguishes this process's status versions from a previous run's in ETags
+BOOT_ID = time.time_ns()
+
+# Seconds between keep-alive comments on an idle status stream
+STREAM_KEEPALIVE = 15
+
+# Each open stream holds a server worker thread; beyond this many, /api/stream
+# answers 503 so the REST endpoints always have workers left
+MAX_STREAMS = 4
+stream_slots = threading.BoundedSemaphore(MAX_STREAMS)
+
+
+def publish_status():
+    """Publish fresh snapshots of bot_status and pair_status"""
+    # Publishers are serialized so an older snapshot can never replace a
+    # newer one; list() copies the items in one step, so a concurrent
+    # add/remove_pair cannot change the dict mid-iteration
+    with status_changed:
+        bot_status_ref[0] = BotStatus.from_dict(bot_status)
+        pair_status_ref[0] = {pair: dict(status) for pair, status in list(pair_status.items())}
+        status_version[0] += 1
+        status_changed.notify_all()
+
 # Create the HTML template
 template_path = os.path.join('templates', 'index.html')
 with open(template_path, 'w') as f:
@@ -507,152 +569,163 @@ with open(template_path, 'w') as f:
             let tradeHistory = [];
             let executionFeed = [];
             
-            // Update dashboard with latest data
-            function updateDashboard() {
-                // Fetch bot status
-                fetch('/api/status')
-                    .then(response => response.json())
-                    .then(data => {
-                        // Update bot status elements
-                        const botStatusEl = document.getElementById('bot-status');
-                        botStatusEl.textContent = data.is_running ? 'Running' : 'Stopped';
-                        botStatusEl.className = data.is_running ? 'badge bg-success status-badge' : 'badge bg-danger status-badge';
-                        
-                        const toggleBotBtn = document.getElementById('toggle-bot');
-                        toggleBotBtn.textContent = data.is_running ? 'Stop Bot' : 'Start Bot';
-                        toggleBotBtn.className = data.is_running ? 'btn btn-danger w-100' : 'btn btn-success w-100';
-                        
-                        document.getElementById('strategy-selector').value = data.strategy;
-                        document.getElementById('total-value').textContent = '$' + data.total_value.toFixed(2);
-                        document.getElementById('total-trades').textContent = data.total_trades;
-                        document.getElementById('win-rate').textContent = data.win_rate.toFixed(1) + '%';
-                        document.getElementById('active-positions').textContent = data.active_positions;
-                        document.getElementById('last-update').textContent = data.last_update;
-                        
-                        // Update daily bias
-                        const dailyBiasEl = document.getElementById('daily-bias');
-                        if (data.daily_bias) {
-                            dailyBiasEl.textContent = data.daily_bias.toUpperCase();
-                            dailyBiasEl.className = 'bias-' + data.daily_bias.toLowerCase();
-                        }
-                    });
+            // Render the bot status
+            function renderStatus(data) {
+                // Update bot status elements
+                const botStatusEl = document.getElementById('bot-status');
+                botStatusEl.textContent = data.is_running ? 'Running' : 'Stopped';
+                botStatusEl.className = data.is_running ? 'badge bg-success status-badge' : 'badge bg-danger status-badge';
                 
-                // Fetch pair status
-                fetch('/api/pair_status')
-                    .then(response => response.json())
-                    .then(data => {
-                        // Clear existing pairs
-                        const pairsContainer = document.getElementById('pairs-container');
-                        pairsContainer.innerHTML = '';
-                        
-                        // Add each pair
-                        Object.values(data).forEach(pair => {
-                            const pairCard = document.createElement('div');
-                            pairCard.className = 'col-md-6 mb-3';
-                            
-                            // Check if we have a position for enhanced display
-                            const hasPosition = pair.position !== undefined && pair.position !== null && pair.position !== '';
-                            
-                            pairCard.innerHTML = `
-                                <div class="card pair-card ${hasPosition ? 'border-' + (pair.position === 'long' ? 'success' : 'danger') : ''}">
-                                    <div class="card-header d-flex justify-content-between align-items-center">
-                                        <h5 class="card-title mb-0">${pair.trading_pair}</h5>
-                                        <span class="bias-${pair.daily_bias || 'neutral'}">${pair.daily_bias ? pair.daily_bias.toUpperCase() : 'NEUTRAL'}</span>
+                const toggleBotBtn = document.getElementById('toggle-bot');
+                toggleBotBtn.textContent = data.is_running ? 'Stop Bot' : 'Start Bot';
+                toggleBotBtn.className = data.is_running ? 'btn btn-danger w-100' : 'btn btn-success w-100';
+                
+                document.getElementById('strategy-selector').value = data.strategy;
+                document.getElementById('total-value').textContent = '$' + data.total_value.toFixed(2);
+                document.getElementById('total-trades').textContent = data.total_trades;
+                document.getElementById('win-rate').textContent = data.win_rate.toFixed(1) + '%';
+                document.getElementById('active-positions').textContent = data.active_positions;
+                document.getElementById('last-update').textContent = data.last_update;
+                
+                // Update daily bias
+                const dailyBiasEl = document.getElementById('daily-bias');
+                if (data.daily_bias) {
+                    dailyBiasEl.textContent = data.daily_bias.toUpperCase();
+                    dailyBiasEl.className = 'bias-' + data.daily_bias.toLowerCase();
+                }
+            }
+            
+            // Render the trading pair cards
+            function renderPairs(data) {
+                // Clear existing pairs
+                const pairsContainer = document.getElementById('pairs-container');
+                pairsContainer.innerHTML = '';
+                
+                // Add each pair
+                Object.values(data).forEach(pair => {
+                    const pairCard = document.createElement('div');
+                    pairCard.className = 'col-md-6 mb-3';
+                    
+                    // Check if we have a position for enhanced display
+                    const hasPosition = pair.position !== undefined && pair.position !== null && pair.position !== '';
+                    
+                    pairCard.innerHTML = `
+                        <div class="card pair-card ${hasPosition ? 'border-' + (pair.position === 'long' ? 'success' : 'danger') : ''}">
+                            <div class="card-header d-flex justify-content-between align-items-center">
+                                <h5 class="card-title mb-0">${pair.trading_pair}</h5>
+                                <span class="bias-${pair.daily_bias || 'neutral'}">${pair.daily_bias ? pair.daily_bias.toUpperCase() : 'NEUTRAL'}</span>
+                            </div>
+                            <div class="card-body">
+                                <div class="position-info ${hasPosition ? '' : 'd-none'}">
+                                    <div class="alert alert-${pair.position === 'long' ? 'success' : 'danger'} mb-2">
+                                        <strong>OPEN ${pair.position ? pair.position.toUpperCase() : ''} POSITION</strong>
+                                    </div>
+                                    <div class="row">
+                                        <div class="col-6">
+                                            <small class="text-muted">Entry Price:</small>
+                                            <p class="mb-1">$${pair.entry_price ? pair.entry_price.toFixed(2) : '-'}</p>
+                                        </div>
+                                        <div class="col-6">
+                                            <small class="text-muted">Entry Time:</small>
+                                            <p class="mb-1">${pair.entry_time || 'N/A'}</p>
+                                        </div>
+                                    </div>
+                                    <div class="row">
+                                        <div class="col-6">
+                                            <small class="text-muted">Current Price:</small>
+                                            <p class="mb-1">$${pair.current_price ? pair.current_price.toFixed(2) : '-'}</p>
+                                        </div>
+                                        <div class="col-6">
+                                            <small class="text-muted">Position Size:</small>
+                                            <p class="mb-1">${pair.position_size || 'N/A'}</p>
+                                        </div>
+                                    </div>
+                                    <div class="row">
+                                        <div class="col-6">
+                                            <small class="text-muted">Stop Loss:</small>
+                                            <p class="mb-1">$${pair.stop_loss ? pair.stop_loss.toFixed(2) : 'N/A'}</p>
+                                        </div>
+                                        <div class="col-6">
+                                            <small class="text-muted">Take Profit:</small>
+                                            <p class="mb-1">$${pair.take_profit ? pair.take_profit.toFixed(2) : 'N/A'}</p>
+                                        </div>
                                     </div>
-                                    <div class="card-body">
-                                        <div class="position-info ${hasPosition ? '' : 'd-none'}">
-                                            <div class="alert alert-${pair.position === 'long' ? 'success' : 'danger'} mb-2">
-                                                <strong>OPEN ${pair.position ? pair.position.toUpperCase() : ''} POSITION</strong>
-                                            </div>
-                                            <div class="row">
-                                                <div class="col-6">
-                                                    <small class="text-muted">Entry Price:</small>
-                                                    <p class="mb-1">$${pair.entry_price ? pair.entry_price.toFixed(2) : '-'}</p>
-                                                </div>
-                                                <div class="col-6">
-                                                    <small class="text-muted">Entry Time:</small>
-                                                    <p class="mb-1">${pair.entry_time || 'N/A'}</p>
-                                                </div>
-                                            </div>
-                                            <div class="row">
-                                                <div class="col-6">
-                                                    <small class="text-muted">Current Price:</small>
-                                                    <p class="mb-1">$${pair.current_price ? pair.current_price.toFixed(2) : '-'}</p>
-                                                </div>
-                                                <div class="col-6">
-                                                    <small class="text-muted">Position Size:</small>
-                                                    <p class="mb-1">${pair.position_size || 'N/A'}</p>
-                                                </div>
-                                            </div>
-                                            <div class="row">
-                                                <div class="col-6">
-                                                    <small class="text-muted">Stop Loss:</small>
-                                                    <p class="mb-1">$${pair.stop_loss ? pair.stop_loss.toFixed(2) : 'N/A'}</p>
-                                                </div>
-                                                <div class="col-6">
-                                                    <small class="text-muted">Take Profit:</small>
-                                                    <p class="mb-1">$${pair.take_profit ? pair.take_profit.toFixed(2) : 'N/A'}</p>
-                                                </div>
-                                            </div>
-                                            <div class="row">
-                                                <div class="col-6">
-                                                    <small class="text-muted">PnL %:</small>
-                                                    <p class="mb-1 ${pair.pnl > 0 ? 'text-success' : pair.pnl < 0 ? 'text-danger' : ''}">${pair.pnl ? (pair.pnl > 0 ? '+' : '') + pair.pnl.toFixed(2) + '%' : 'N/A'}</p>
-                                                </div>
-                                                <div class="col-6">
-                                                    <small class="text-muted">PnL $:</small>
-                                                    <p class="mb-1 ${pair.pnl_absolute > 0 ? 'text-success' : pair.pnl_absolute < 0 ? 'text-danger' : ''}">${pair.pnl_absolute ? (pair.pnl_absolute > 0 ? '+$' : '-$') + Math.abs(pair.pnl_absolute).toFixed(2) : 'N/A'}</p>
-                                                </div>
-                                            </div>
-                                            <div class="row">
-                                                <div class="col-12">
-                                                    <small class="text-muted">Duration:</small>
-                                                    <p class="mb-1">${pair.position_duration || 'N/A'}</p>
-                                                </div>
-                                            </div>
+                                    <div class="row">
+                                        <div class="col-6">
+                                            <small class="text-muted">PnL %:</small>
+                                            <p class="mb-1 ${pair.pnl > 0 ? 'text-success' : pair.pnl < 0 ? 'text-danger' : ''}">${pair.pnl ? (pair.pnl > 0 ? '+' : '') + pair.pnl.toFixed(2) + '%' : 'N/A'}</p>
                                         </div>
-                                        <div class="no-position-info ${hasPosition ? 'd-none' : ''}">
-                                            <div class="alert alert-secondary mb-2">NO OPEN POSITION</div>
-                                            <div class="d-flex justify-content-between mb-2">
-                                                <span>Current Price:</span>
-                                                <span>$${pair.current_price ? pair.current_price.toFixed(2) : '-'}</span>
-                                            </div>
-                                            <div class="d-flex justify-content-between mb-2">
-                                                <span>Last Trade:</span>
-                                                <span>${pair.last_trade_time || 'None'}</span>
-                                            </div>
+                                        <div class="col-6">
+                                            <small class="text-muted">PnL $:</small>
+                                            <p class="mb-1 ${pair.pnl_absolute > 0 ? 'text-success' : pair.pnl_absolute < 0 ? 'text-danger' : ''}">${pair.pnl_absolute ? (pair.pnl_absolute > 0 ? '+$' : '-$') + Math.abs(pair.pnl_absolute).toFixed(2) : 'N/A'}</p>
                                         </div>
-                                        <div class="mt-3 d-flex justify-content-between">
-                                            <button class="btn btn-sm btn-primary view-trades-btn" data-pair="${pair.trading_pair}">View Trades</button>
-                                            <button class="btn btn-sm btn-outline-danger remove-pair" data-pair="${pair.trading_pair}">Remove</button>
+                                    </div>
+                                    <div class="row">
+                                        <div class="col-12">
+                                            <small class="text-muted">Duration:</small>
+                                            <p class="mb-1">${pair.position_duration || 'N/A'}</p>
                                         </div>
                                     </div>
                                 </div>
-                            `;
-                            
-                            pairsContainer.appendChild(pairCard);
-                        });
-                        
-                        // Add event listeners for remove pair buttons and trade view buttons
-                        document.querySelectorAll('.remove-pair').forEach(button => {
-                            button.addEventListener('click', function(e) {
-                                e.stopPropagation();
-                                const pair = this.getAttribute('data-pair');
-                                removePair(pair);
-                            });
-                        });
-                        
-                        document.querySelectorAll('.view-trades-btn').forEach(button => {
-                            button.addEventListener('click', function(e) {
-                                e.stopPropagation();
-                                const pair = this.getAttribute('data-pair');
-                                document.getElementById('trade-filter').value = pair;
-                                displayFilteredTrades();
-                            });
-                        });
+                                <div class="no-position-info ${hasPosition ? 'd-none' : ''}">
+                                    <div class="alert alert-secondary mb-2">NO OPEN POSITION</div>
+                                    <div class="d-flex justify-content-between mb-2">
+                                        <span>Current Price:</span>
+                                        <span>$${pair.current_price ? pair.current_price.toFixed(2) : '-'}</span>
+                                    </div>
+                                    <div class="d-flex justify-content-between mb-2">
+                                        <span>Last Trade:</span>
+                                        <span>${pair.last_trade_time || 'None'}</span>
+                                    </div>
+                                </div>
+                                <div class="mt-3 d-flex justify-content-between">
+                                    <button class="btn btn-sm btn-primary view-trades-btn" data-pair="${pair.trading_pair}">View Trades</button>
+                                    <button class="btn btn-sm btn-outline-danger remove-pair" data-pair="${pair.trading_pair}">Remove</button>
+                                </div>
+                            </div>
+                        </div>
+                    `;
+                    
+                    pairsContainer.appendChild(pairCard);
+                });
+                
+                // Add event listeners for remove pair buttons and trade view buttons
+                document.querySelectorAll('.remove-pair').forEach(button => {
+                    button.addEventListener('click', function(e) {
+                        e.stopPropagation();
+                        const pair = this.getAttribute('data-pair');
+                        removePair(pair);
                     });
+                });
+                
+                document.querySelectorAll('.view-trades-btn').forEach(button => {
+                    button.addEventListener('click', function(e) {
+                        e.stopPropagation();
+                        const pair = this.getAttribute('data-pair');
+                        document.getElementById('trade-filter').value = pair;
+                        displayFilteredTrades();
+                    });
+                });
             }
             
+            // Update dashboard with latest data
+            function updateDashboard() {
+                fetch('/api/status')
+                    .then(response => response.json())
+                    .then(renderStatus);
+                fetch('/api/pair_status')
+                    .then(response => response.json())
+                    .then(renderPairs);
+            }
+            
+            // Live updates pushed by the server whenever the status changes
+            const statusStream = new EventSource('/api/stream');
+            statusStream.onmessage = function(event) {
+                const data = JSON.parse(event.data);
+                renderStatus(data.status);
+                renderPairs(data.pairs);
+            };
+            
             // Function to update trade history
             function updateTradeHistory() {
                 fetch('/api/trade_history')
@@ -861,6 +934,7 @@ def initialize_demo_data():
             'total_value': 0.0
         }
     }
+    publish_status()
 
 # Sample trades data for demonstration
 trades_data = {
@@ -896,7 +970,10 @@ def update_bot_status(status_update):
     """Update the bot status with new information"""
     global bot_status
     bot_status.update(status_update)
-    logger.info(f"Bot status updated: {bot_status['is_running']}, Strategy: {bot_status['strategy']}, Pairs: {bot_status['pairs']}")
+    publish_status()
+    # Called on every status change, so log lazily at debug level
+    logger.debug("Bot status updated: %s, Strategy: %s, Pairs: %s",
+                 bot_status['is_running'], bot_status['strategy'], bot_status['pairs'])
 
 def update_pair_status(pair, status_update):
     """Update the status of a specific trading pair"""
@@ -905,7 +982,8 @@ def update_pair_status(pair, status_update):
         pair_status[pair].update(status_update)
     else:
         pair_status[pair] = status_update
-    logger.info(f"Pair status updated: {pair}")
+    publish_status()
+    logger.debug("Pair status updated: %s", pair)
 
 def add_trade(trade_data):
     """Add a new trade to the trades log"""
@@ -914,22 +992,80 @@ def add_trade(trade_data):
     # Keep only the most recent 50 trades
     if len(trades_data['trades']) > 50:
         trades_data['trades'] = trades_data['trades'][:50]
-    logger.info(f"Trade added: {trade_data['pair']} {trade_data['type']} at {trade_data['price']}")
+    logger.info("Trade added: %s %s at %s", trade_data['pair'], trade_data['type'], trade_data['price'])
 
 @app.route('/')
 def index():
     """Render the main dashboard page"""
     return render_template('dashboard.html')
 
+def enable_fast_json(app):
+    """Serialize the Flask app's JSON responses with orjson when it is installed"""
+    try:
+        import orjson
+    except ImportError:
+        logger.info("orjson not installed, using the default JSON encoder")
+        return
+    from flask.json.provider import DefaultJSONProvider
+    
+    class OrjsonProvider(DefaultJSONProvider):
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode()
+        
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+    
+    app.json = OrjsonProvider(app)
+
+def versioned_json(version, payload):
+    """JSON response tagged with the status version; 304 if the client has it"""
+    response = jsonify(payload)
+    response.set_etag(f"{BOOT_ID}-{version}")
+    # Cached copies must be revalidated, which is a cheap 304 until the next publish
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
 @app.route('/api/status')
 def get_status():
     """Return the current status of the bot"""
-    return jsonify(bot_status)
+    # Read the version first: a publish in between only makes the tag stale, never the payload
+    version = status_version[0]
+    return versioned_json(version, bot_status_ref[0].to_dict())
 
 @app.route('/api/pair_status')
 def get_pair_status():
     """Return the status of all trading pairs"""
-    return jsonify(pair_status)
+    version = status_version[0]
+    return versioned_json(version, pair_status_ref[0])
+
+@app.route('/api/stream')
+def stream_status():
+    """Push the bot and pair status to the client whenever it is republished"""
+    if not stream_slots.acquire(blocking=False):
+        return Response("Too many open status streams", status=503,
+                        headers={'Retry-After': str(STREAM_KEEPALIVE)})
+
+    def events():
+        version = None
+        while True:
+            with status_changed:
+                status_changed.wait_for(lambda: status_version[0] != version, STREAM_KEEPALIVE)
+                changed = status_version[0] != version
+                version = status_version[0]
+            if changed:
+                # Same encoder as the REST endpoints (orjson once enabled)
+                payload = app.json.dumps({'status': bot_status_ref[0].to_dict(),
+                                          'pairs': pair_status_ref[0]})
+                yield f"data: {payload}\n\n"
+            else:
+                yield ": keep-alive\n\n"
+
+    response = Response(events(), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache'})
+    # The server closes the response when the client goes away, even if the
+    # stream was never iterated
+    response.call_on_close(stream_slots.release)
+    return response
 
 @app.route('/api/trades')
 def get_trades():
@@ -941,6 +1077,7 @@ def toggle_bot():
     """Toggle the bot's running status"""
     global bot_status
     bot_status['is_running'] = not bot_status['is_running']
+    publish_status()
     logger.info(f"Bot status toggled to: {'running' if bot_status['is_running'] else 'stopped'}")
     return jsonify({'success': True, 'is_running': bot_status['is_running']})
 
@@ -958,6 +1095,7 @@ def change_strategy():
         return jsonify({'success': False, 'error': 'Invalid strategy'})
     
     bot_status['strategy'] = strategy
+    publish_status()
     logger.info(f"Strategy changed to: {strategy}")
     
     return jsonify({'success': True, 'strategy': strategy})
@@ -1025,6 +1163,7 @@ def remove_pair():
     # Remove pair from pair status
     if pair in pair_status:
         del pair_status[pair]
+    publish_status()
     
     logger.info(f"Removed trading pair: {pair}")
     
@@ -1154,6 +1293,37 @@ def serve_chart(filename):
     """Serve chart images"""
     return send_from_directory('charts', filename)
 
+# Dashboard state saved on exit and reused by a restart within STATE_MAX_AGE
+# seconds; only the standalone dashboard (run_dashboard.py) opts in
+STATE_FILE = os.path.join('logs', 'dashboard_state.json')
+STATE_MAX_AGE = 60
+
+def load_saved_state():
+    """Restore bot_status and pair_status from a recent STATE_FILE, returns True on success"""
+    try:
+        if os.path.getmtime(STATE_FILE) < time.time() - STATE_MAX_AGE:
+            return False
+        with open(STATE_FILE) as f:
+            state = json.load(f)
+        saved_bot, saved_pairs = state['bot_status'], state['pair_status']
+    except (OSError, ValueError, KeyError):
+        return False
+    # Updated in place: other modules hold references to these dicts
+    bot_status.update(saved_bot)
+    pair_status.clear()
+    pair_status.update(saved_pairs)
+    publish_status()
+    logger.info(f"Restored dashboard state from {STATE_FILE}")
+    return True
+
+def save_state():
+    """Write bot_status and pair_status to STATE_FILE"""
+    try:
+        with open(STATE_FILE, 'w') as f:
+            json.dump({'bot_status': bot_status, 'pair_status': pair_status}, f)
+    except (OSError, TypeError) as e:
+        logger.error(f"Could not save dashboard state: {e}")
+
 # Initialize demo data for testing
 initialize_demo_data()
 
@@ -1,28 +1,38 @@
 from BinanceClient import BinanceClient
+from _ict import SwingTracker, liquidity_sweeps, fair_value_gaps, FVGTable, market_structure
 import key
 import time, datetime
 import pandas as pd
 import numpy as np
 import ta
 import sys
+import logging
+
+# per-tick status lines are logged lazily; detections and trades are printed
+logger = logging.getLogger(__name__)
 
 
 class LoggingPrinter:
     def __init__(self):
         self.old_stdout = sys.stdout
+        # Opened once and line buffered instead of reopened on every write
+        self.out_file = open("enhanced_ict_strategy.log", 'a', buffering=1)
         sys.stdout = self
     
     def write(self, text):
-        self.out_file = open("enhanced_ict_strategy.log", 'a')
         self.old_stdout.write(text)
         self.out_file.write(text)
-        self.out_file.close()
+    
+    def flush(self):
+        self.old_stdout.flush()
+        self.out_file.flush()
     
     def __enter__(self):
         return self
     
     def __exit__(self, type, value, traceback):
         sys.stdout = self.old_stdout
+        self.out_file.close()
 
 
 class EnhancedICTStrategyClient(BinanceClient):
@@ -52,7 +62,9 @@ class EnhancedICTStrategyClient(BinanceClient):
         # Strategy state variables
         self.daily_bias = None        # 'bullish' or 'bearish' based on daily timeframe
         self.htf_bias = None          # 'bullish' or 'bearish' based on HTF
-        self.active_fvgs = []         # List of active FVGs
+        self.active_fvgs = FVGTable()  # Active FVGs, one array per field
+        self._htf_swings = SwingTracker()
+        self._ohlc = (None, None)
         self.pending_orders = []      # List of pending orders for FVG retests
         self.last_liquidity_sweep = None
         
@@ -61,6 +73,7 @@ class EnhancedICTStrategyClient(BinanceClient):
         self.htf_df = None            # Higher timeframe dataframe
         self.mtf_df = None            # Medium timeframe dataframe
         self.ltf_df = None            # Lower timeframe dataframe
+        self._processed = None        # Frames last run through data_process
         
         # Risk management
         self.risk_per_trade = 0.01    # 1% risk per trade
@@ -69,33 +82,23 @@ class EnhancedICTStrategyClient(BinanceClient):
     
     def update(self):
         """Override the update method to fetch all timeframes"""
-        super().update()  # Call parent's update first
+        # Get all timeframe data, fetching only candles newer than the last
+        # update, while the parent's update fetches account, tickers and LTF data
+        daily = self._fetch_pool.submit(self.update_candles, self.daily_interval, self.daily_df_length)
+        htf = self._fetch_pool.submit(self.update_candles, self.htf_interval, self.htf_df_length)
+        mtf = self._fetch_pool.submit(self.update_candles, self.mtf_interval, self.mtf_df_length)
+        super().update()
 
         # Store the current LTF dataframe
-        self.ltf_df = self.df.copy()
-        
-        # Get all timeframe data
-        original_interval = self.interval
-        original_df_length = self.df_length
-        
-        # Get daily data for bias
-        self.interval = self.daily_interval
-        self.df_length = self.daily_df_length
-        self.daily_df = self.get_candles()
+        # self.df is rebound, never written in place, and the LTF steps only
+        # read from it, so no copy is needed; the HTF frames that get swing
+        # columns are built fresh by update_candles
+        self.ltf_df = self.df
         
-        # Get HTF data
-        self.interval = self.htf_interval
-        self.df_length = self.htf_df_length
-        self.htf_df = self.get_candles()
-        
-        # Get MTF data
-        self.interval = self.mtf_interval
-        self.df_length = self.mtf_df_length
-        self.mtf_df = self.get_candles()
-        
-        # Restore original settings
-        self.interval = original_interval
-        self.df_length = original_df_length
+        # Daily data for bias, HTF and MTF data
+        self.daily_df = daily.result()
+        self.htf_df = htf.result()
+        self.mtf_df = mtf.result()
         
         # Process all dataframes
         self.data_process()
@@ -104,6 +107,13 @@ class EnhancedICTStrategyClient(BinanceClient):
         """Process all timeframes"""
         if self.ltf_df is None or self.htf_df is None or self.mtf_df is None or self.daily_df is None:
             return
+        
+        # update() and trade_loop both call this; the frames are only ever
+        # rebound, so identical objects mean there is nothing new to process
+        frames = (self.ltf_df, self.htf_df, self.mtf_df, self.daily_df)
+        if self._processed is not None and all(a is b for a, b in zip(frames, self._processed)):
+            return
+        self._processed = frames
             
         # Process daily timeframe for overall market bias
         self.process_daily_data()
@@ -137,7 +147,7 @@ class EnhancedICTStrategyClient(BinanceClient):
         else:
             self.daily_bias = 'neutral'
         
-        print(f"Daily Bias: {self.daily_bias}")
+        logger.info("Daily Bias: %s", self.daily_bias)
         
     def process_htf_data(self):
         """Process higher timeframe data for market structure"""
@@ -150,67 +160,32 @@ class EnhancedICTStrategyClient(BinanceClient):
         self.htf_bias = self.determine_market_structure(df)
         
         # Log the current bias
-        print(f"HTF Bias: {self.htf_bias}")
+        logger.info("HTF Bias: %s", self.htf_bias)
+    
+    def ohlc(self, df):
+        """open, high, low and close of df as NumPy arrays, converted once per frame"""
+        # Frames are rebound on update, never written in place, so the
+        # arrays stay valid for as long as the same frame is passed in
+        frame, arrays = self._ohlc
+        if frame is not df:
+            arrays = tuple(df[col].to_numpy() for col in ('open', 'high', 'low', 'close'))
+            self._ohlc = (df, arrays)
+        return arrays
     
     def calculate_swings(self, df, window=5):
         """Calculate swing highs and lows"""
-        df['swing_high'] = False
-        df['swing_low'] = False
-        
-        for i in range(window, len(df) - window):
-            # Check for swing high
-            if all(df['high'].iloc[i] > df['high'].iloc[i-j] for j in range(1, window+1)) and \
-               all(df['high'].iloc[i] > df['high'].iloc[i+j] for j in range(1, window+1)):
-                df.at[df.index[i], 'swing_high'] = True
-            
-            # Check for swing low
-            if all(df['low'].iloc[i] < df['low'].iloc[i-j] for j in range(1, window+1)) and \
-               all(df['low'].iloc[i] < df['low'].iloc[i+j] for j in range(1, window+1)):
-                df.at[df.index[i], 'swing_low'] = True
+        # Only the HTF frame is swing-scanned; the tracker reuses the swings
+        # of candles that have not changed since the last update
+        if self._htf_swings.window != window:
+            self._htf_swings = SwingTracker(window)
+        df['swing_high'], df['swing_low'] = self._htf_swings.update(
+            df['timestamp'].to_numpy(), df['high'].to_numpy(dtype=np.float64),
+            df['low'].to_numpy(dtype=np.float64))
         
     def determine_market_structure(self, df):
         """Determine market structure as bullish or bearish"""
-        # Get last 4 swing points
-        recent_swings = pd.DataFrame()
-        
-        # Extract swing highs
-        swing_highs = df[df['swing_high'] == True].copy()
-        swing_highs['type'] = 'high'
-        swing_highs['value'] = swing_highs['high']
-        
-        # Extract swing lows
-        swing_lows = df[df['swing_low'] == True].copy()
-        swing_lows['type'] = 'low'
-        swing_lows['value'] = swing_lows['low']
-        
-        # Combine and sort
-        swings = pd.concat([swing_highs, swing_lows])
-        swings = swings.sort_index().tail(4)
-        
-        if len(swings) < 4:
-            # Not enough swing points, use SMA slope as fallback
-            sma50 = df['close'].rolling(50).mean()
-            sma20 = df['close'].rolling(20).mean()
-            
-            if sma20.iloc[-1] > sma50.iloc[-1] and sma20.iloc[-1] > sma20.iloc[-2]:
-                return 'bullish'
-            elif sma20.iloc[-1] < sma50.iloc[-1] and sma20.iloc[-1] < sma20.iloc[-2]:
-                return 'bearish'
-            else:
-                return 'neutral'
-        
-        # Check if we have higher highs and higher lows (bullish)
-        if swings['type'].iloc[-2] == 'high' and swings['type'].iloc[-4] == 'high':
-            if swings['value'].iloc[-2] > swings['value'].iloc[-4]:
-                return 'bullish'
-        
-        # Check if we have lower lows and lower highs (bearish)
-        if swings['type'].iloc[-2] == 'low' and swings['type'].iloc[-4] == 'low':
-            if swings['value'].iloc[-2] < swings['value'].iloc[-4]:
-                return 'bearish'
-        
-        # Default to neutral
-        return 'neutral'
+        return market_structure(df['high'].to_numpy(), df['low'].to_numpy(), df['close'].to_numpy(),
+                                df['swing_high'].to_numpy(), df['swing_low'].to_numpy())
     
     def process_mtf_data(self):
         """Process medium timeframe data for confirmation"""
@@ -226,16 +201,21 @@ class EnhancedICTStrategyClient(BinanceClient):
         # Detect CHOCH (Change of Character)
         self.detect_choch(df)
     
+    def recent_swings(self, df, count=3):
+        """Prices of the last `count` swing highs and swing lows, oldest first"""
+        highs = np.flatnonzero(df['swing_high'].to_numpy(dtype=bool))[-count:]
+        lows = np.flatnonzero(df['swing_low'].to_numpy(dtype=bool))[-count:]
+        return df['high'].to_numpy()[highs], df['low'].to_numpy()[lows]
+    
     def detect_bos(self, df):
         """Detect Break of Structure (BOS)"""
         # Identify recent swing highs and lows
-        recent_highs = df[df['swing_high'] == True].tail(3)
-        recent_lows = df[df['swing_low'] == True].tail(3)
+        recent_highs, recent_lows = self.recent_swings(df)
         
         # Check for bullish BOS (breaking above recent swing high)
         if len(recent_highs) >= 2:
-            last_high = recent_highs['high'].iloc[-1]
-            prev_high = recent_highs['high'].iloc[-2]
+            last_high = recent_highs[-1]
+            prev_high = recent_highs[-2]
             
             if last_high > prev_high and self.daily_bias == 'bullish':
                 print(f"Detected Bullish BOS: {last_high} > {prev_high}")
@@ -243,8 +223,8 @@ class EnhancedICTStrategyClient(BinanceClient):
         
         # Check for bearish BOS (breaking below recent swing low)
         if len(recent_lows) >= 2:
-            last_low = recent_lows['low'].iloc[-1]
-            prev_low = recent_lows['low'].iloc[-2]
+            last_low = recent_lows[-1]
+            prev_low = recent_lows[-2]
             
             if last_low < prev_low and self.daily_bias == 'bearish':
                 print(f"Detected Bearish BOS: {last_low} < {prev_low}")
@@ -259,24 +239,23 @@ class EnhancedICTStrategyClient(BinanceClient):
         # For bearish CHOCH: Price makes a lower low (BOS) but then fails to make a new lower low
         
         # This is a simplified implementation
-        recent_highs = df[df['swing_high'] == True].tail(3)
-        recent_lows = df[df['swing_low'] == True].tail(3)
+        recent_highs, recent_lows = self.recent_swings(df)
         
         if len(recent_highs) >= 3 and len(recent_lows) >= 2:
             # Check for bullish CHOCH
-            if recent_highs['high'].iloc[-1] < recent_highs['high'].iloc[-2] and \
-               recent_lows['low'].iloc[-1] > recent_lows['low'].iloc[-2] and \
+            if recent_highs[-1] < recent_highs[-2] and \
+               recent_lows[-1] > recent_lows[-2] and \
                self.daily_bias == 'bullish':
                 print(f"Detected Bullish CHOCH")
-                return {'type': 'bullish', 'price': recent_lows['low'].iloc[-1]}
+                return {'type': 'bullish', 'price': recent_lows[-1]}
         
         if len(recent_lows) >= 3 and len(recent_highs) >= 2:
             # Check for bearish CHOCH
-            if recent_lows['low'].iloc[-1] > recent_lows['low'].iloc[-2] and \
-               recent_highs['high'].iloc[-1] < recent_highs['high'].iloc[-2] and \
+            if recent_lows[-1] > recent_lows[-2] and \
+               recent_highs[-1] < recent_highs[-2] and \
                self.daily_bias == 'bearish':
                 print(f"Detected Bearish CHOCH")
-                return {'type': 'bearish', 'price': recent_highs['high'].iloc[-1]}
+                return {'type': 'bearish', 'price': recent_highs[-1]}
         
         return None
     
@@ -302,20 +281,17 @@ class EnhancedICTStrategyClient(BinanceClient):
     
     def detect_liquidity_sweeps(self, df):
         """Detect liquidity sweeps of recent swing points"""
-        # Look at the last 5 candles
-        recent_candles = df.tail(5)
-        
         # Find recent swing lows and highs
         lookback = self.liquidity_lookback
         if len(df) <= lookback:
             return None
             
-        # Find the lowest low and highest high in the lookback period (excluding last 5 candles)
-        recent_low = df['low'].iloc[-lookback:-5].min()
-        recent_high = df['high'].iloc[-lookback:-5].max()
+        # Compare the last 5 candles with the lowest low and highest high of
+        # the lookback period before them
+        bullish, recent_low, bearish, recent_high = liquidity_sweeps(*self.ohlc(df), lookback)
         
         # Check if recent candles have swept below the swing low and then reversed
-        if any(recent_candles['low'] < recent_low * 0.999) and recent_candles['close'].iloc[-1] > recent_candles['open'].iloc[-1]:
+        if bullish:
             # Bullish sweep (swept lows then reversed up)
             if self.daily_bias == 'bullish':  # Only consider sweeps in the direction of daily bias
                 print(f"Detected Bullish Liquidity Sweep: Swept low at {recent_low}")
@@ -328,7 +304,7 @@ class EnhancedICTStrategyClient(BinanceClient):
                 return self.last_liquidity_sweep
         
         # Check if recent candles have swept above the swing high and then reversed
-        if any(recent_candles['high'] > recent_high * 1.001) and recent_candles['close'].iloc[-1] < recent_candles['open'].iloc[-1]:
+        if bearish:
             # Bearish sweep (swept highs then reversed down)
             if self.daily_bias == 'bearish':  # Only consider sweeps in the direction of daily bias
                 print(f"Detected Bearish Liquidity Sweep: Swept high at {recent_high}")
@@ -354,162 +330,105 @@ class EnhancedICTStrategyClient(BinanceClient):
         if len(df) < sweep_idx + 3:
             return
             
-        # Check for bullish FVG (Candle 3's low is above Candle 1's high)
-        if self.last_liquidity_sweep['type'] == 'bullish':
-            # Get candles involved in potential FVG
-            candle1_idx = sweep_idx
-            candle2_idx = sweep_idx + 1  # Displacement candle
-            candle3_idx = sweep_idx + 2
-            
-            candle1 = df.iloc[candle1_idx]
-            candle2 = df.iloc[candle2_idx]
-            candle3 = df.iloc[candle3_idx]
-            
-            # Check if candle 2 is a strong bullish candle
-            is_bullish_displacement = (candle2['close'] > candle2['open'] and 
-                                    (candle2['close'] - candle2['open']) / candle2['open'] > 0.001)
-            
-            # Check if there's a gap between candle 1 high and candle 3 low
-            if is_bullish_displacement and candle3['low'] > candle1['high']:
-                fvg_size = (candle3['low'] - candle1['high']) / candle1['high']
-                
-                # Only consider significant FVGs
-                if fvg_size > 0.001:  # At least 0.1% gap
-                    print(f"Detected Bullish FVG: Size {fvg_size:.4%}")
-                    
-                    # Add to active FVGs
-                    fvg = {
-                        'type': 'bullish',
-                        'top': candle3['low'],
-                        'bottom': candle1['high'],
-                        'size': fvg_size,
-                        'age': 0,
-                        'created_at': df.index[candle3_idx]
-                    }
-                    
-                    self.active_fvgs.append(fvg)
-                    return fvg
-        
-        # Check for bearish FVG (Candle 3's high is below Candle 1's low)
-        elif self.last_liquidity_sweep['type'] == 'bearish':
-            # Get candles involved in potential FVG
-            candle1_idx = sweep_idx
-            candle2_idx = sweep_idx + 1  # Displacement candle
-            candle3_idx = sweep_idx + 2
-            
-            candle1 = df.iloc[candle1_idx]
-            candle2 = df.iloc[candle2_idx]
-            candle3 = df.iloc[candle3_idx]
-            
-            # Check if candle 2 is a strong bearish candle
-            is_bearish_displacement = (candle2['close'] < candle2['open'] and 
-                                    (candle2['open'] - candle2['close']) / candle2['open'] > 0.001)
-            
-            # Check if there's a gap between candle 1 low and candle 3 high
-            if is_bearish_displacement and candle3['high'] < candle1['low']:
-                fvg_size = (candle1['low'] - candle3['high']) / candle1['low']
-                
-                # Only consider significant FVGs
-                if fvg_size > 0.001:  # At least 0.1% gap
-                    print(f"Detected Bearish FVG: Size {fvg_size:.4%}")
-                    
-                    # Add to active FVGs
-                    fvg = {
-                        'type': 'bearish',
-                        'top': candle1['low'],
-                        'bottom': candle3['high'],
-                        'size': fvg_size,
-                        'age': 0,
-                        'created_at': df.index[candle3_idx]
-                    }
-                    
-                    self.active_fvgs.append(fvg)
-                    return fvg
+        # Scan every 3-candle window from the sweep candle on: candle 1, the
+        # displacement candle 2 and candle 3 whose wick leaves the gap
+        bullish = self.last_liquidity_sweep['type'] == 'bullish'
+        start, top, bottom, fvg_size = fair_value_gaps(
+            *(a[sweep_idx:] for a in self.ohlc(df)), bullish)
+        # Keyed on candle open time, which stays put when newer candles arrive
+        created_at = df['timestamp'].to_numpy()[sweep_idx + start + 2]
+        
+        # Only consider significant FVGs (at least 0.1%) that are not tracked yet
+        new = (fvg_size > 0.001) & np.array([t not in self.active_fvgs for t in created_at], dtype=bool)
+        if not new.any():
+            return None
         
-        return None
+        for s in fvg_size[new]:
+            if bullish:
+                print(f"Detected Bullish FVG: Size {s:.4%}")
+            else:
+                print(f"Detected Bearish FVG: Size {s:.4%}")
+        
+        # Add to active FVGs
+        self.active_fvgs.extend(bullish, top[new], bottom[new], fvg_size[new], created_at[new])
+        return self.active_fvgs.row(len(self.active_fvgs) - 1)
     
     def update_active_fvgs(self, df):
         """Update active FVGs, removing filled or expired ones"""
-        if not self.active_fvgs:
+        fvgs = self.active_fvgs
+        if not fvgs:
             return
             
-        current_price = df['close'].iloc[-1]
-        updated_fvgs = []
+        current_price = self.ohlc(df)[3][-1]
+        
+        # Increment age
+        fvgs.age += 1
+        
+        # FVGs past the lookback expire; a bullish FVG is filled when price
+        # closes below its bottom, a bearish one when it closes above its top
+        expired = fvgs.age > self.fvg_lookback
+        filled = ~expired & np.where(fvgs.is_bull, current_price < fvgs.bottom, current_price > fvgs.top)
+        for i in np.flatnonzero(expired | filled):
+            if expired[i]:
+                kind = 'bullish' if fvgs.is_bull[i] else 'bearish'
+                print(f"FVG expired: {kind} at {fvgs.bottom[i]}-{fvgs.top[i]}")
+            else:
+                kind = 'Bullish' if fvgs.is_bull[i] else 'Bearish'
+                print(f"{kind} FVG filled: {fvgs.bottom[i]}-{fvgs.top[i]}")
         
-        for fvg in self.active_fvgs:
-            # Increment age
-            fvg['age'] += 1
-            
-            # Check if FVG is still valid
-            if fvg['age'] > self.fvg_lookback:
-                print(f"FVG expired: {fvg['type']} at {fvg['bottom']}-{fvg['top']}")
-                continue
-                
-            # Check if FVG has been filled
-            if fvg['type'] == 'bullish' and current_price < fvg['bottom']:
-                print(f"Bullish FVG filled: {fvg['bottom']}-{fvg['top']}")
-                continue
-                
-            if fvg['type'] == 'bearish' and current_price > fvg['top']:
-                print(f"Bearish FVG filled: {fvg['bottom']}-{fvg['top']}")
-                continue
-                
-            # Keep valid FVGs
-            updated_fvgs.append(fvg)
-            
-        self.active_fvgs = updated_fvgs
+        # Keep valid FVGs
+        fvgs.keep(~(expired | filled))
     
     def check_fvg_retests(self, df):
         """Check for retests of FVGs for potential entries"""
-        if not self.active_fvgs:
+        fvgs = self.active_fvgs
+        if not fvgs:
             return
             
-        current_price = df['close'].iloc[-1]
-        current_high = df['high'].iloc[-1]
-        current_low = df['low'].iloc[-1]
-        
-        # Only consider entries aligned with daily bias
-        for fvg in self.active_fvgs:
-            # For bullish FVGs, look for price retesting the top of the FVG
-            if fvg['type'] == 'bullish' and self.daily_bias == 'bullish':
-                if current_low <= fvg['top'] and current_price > fvg['top']:
-                    # Price retested the top of bullish FVG and bounced
-                    print(f"Bullish entry signal: FVG retest at {fvg['top']}")
-                    
-                    # Calculate stop loss and take profit
-                    stop_loss = fvg['bottom'] - (fvg['top'] - fvg['bottom']) * 0.5
-                    take_profit = current_price + (current_price - stop_loss) * self.take_profit_ratio
-                    
-                    # Check if we have enough room for a good risk-reward
-                    if (take_profit - current_price) / (current_price - stop_loss) >= self.risk_reward_ratio:
-                        print(f"Taking bullish trade: Entry={current_price}, SL={stop_loss}, TP={take_profit}")
-                        self.buy()
-                        return True
+        _, high, low, close = self.ohlc(df)
+        current_price = close[-1]
+        current_high = high[-1]
+        current_low = low[-1]
+        
+        # Only consider entries aligned with daily bias. For bullish FVGs,
+        # price retests the top and closes above it; for bearish FVGs, price
+        # retests the bottom and closes below it
+        if self.daily_bias == 'bullish':
+            retest = fvgs.is_bull & (current_low <= fvgs.top) & (current_price > fvgs.top)
+            stop_loss = fvgs.bottom - (fvgs.top - fvgs.bottom) * 0.5
+            take_profit = current_price + (current_price - stop_loss) * self.take_profit_ratio
+            with np.errstate(divide='ignore', invalid='ignore'):
+                rr = (take_profit - current_price) / (current_price - stop_loss)
+        elif self.daily_bias == 'bearish':
+            retest = ~fvgs.is_bull & (current_high >= fvgs.bottom) & (current_price < fvgs.bottom)
+            stop_loss = fvgs.top + (fvgs.top - fvgs.bottom) * 0.5
+            take_profit = current_price - (stop_loss - current_price) * self.take_profit_ratio
+            with np.errstate(divide='ignore', invalid='ignore'):
+                rr = (current_price - take_profit) / (stop_loss - current_price)
+        else:
+            return False
+        
+        for i in np.flatnonzero(retest):
+            if fvgs.is_bull[i]:
+                print(f"Bullish entry signal: FVG retest at {fvgs.top[i]}")
+            else:
+                print(f"Bearish entry signal: FVG retest at {fvgs.bottom[i]}")
             
-            # For bearish FVGs, look for price retesting the bottom of the FVG
-            elif fvg['type'] == 'bearish' and self.daily_bias == 'bearish':
-                if current_high >= fvg['bottom'] and current_price < fvg['bottom']:
-                    # Price retested the bottom of bearish FVG and bounced
-                    print(f"Bearish entry signal: FVG retest at {fvg['bottom']}")
-                    
-                    # Calculate stop loss and take profit
-                    stop_loss = fvg['top'] + (fvg['top'] - fvg['bottom']) * 0.5
-                    take_profit = current_price - (stop_loss - current_price) * self.take_profit_ratio
-                    
-                    # Check if we have enough room for a good risk-reward
-                    if (current_price - take_profit) / (stop_loss - current_price) >= self.risk_reward_ratio:
-                        print(f"Taking bearish trade: Entry={current_price}, SL={stop_loss}, TP={take_profit}")
-                        self.sell()
-                        return True
+            # Check if we have enough room for a good risk-reward
+            if rr[i] >= self.risk_reward_ratio:
+                if fvgs.is_bull[i]:
+                    print(f"Taking bullish trade: Entry={current_price}, SL={stop_loss[i]}, TP={take_profit[i]}")
+                    self.buy()
+                else:
+                    print(f"Taking bearish trade: Entry={current_price}, SL={stop_loss[i]}, TP={take_profit[i]}")
+                    self.sell()
+                return True
         
         return False
     
     def manager(self):
         """Main strategy manager - override parent method"""
-        # Only take trades when daily bias and HTF bias align
-        if self.daily_bias == self.htf_bias and self.daily_bias != 'neutral':
-            # Check for FVG retests
-            self.check_fvg_retests(self.ltf_df)
+        # FVG retests on the latest candles were already checked by data_process
         
         # Manage existing positions
         if self.position_open:
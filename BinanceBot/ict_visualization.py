@@ -2,6 +2,7 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
+from matplotlib.collections import LineCollection, PolyCollection
 from datetime import datetime
 import mplfinance as mpf
 
@@ -22,6 +23,17 @@ class ICTVisualizer:
             'exit': 'purple',
             'stop_loss': 'red'
         }
+        self._fig = None
+        self._ax = None
+    
+    def _figure(self):
+        """Figure and axes reused by every chart, cleared before each redraw"""
+        if self._fig is None or not plt.fignum_exists(self._fig.number):
+            self._fig, self._ax = plt.subplots(figsize=(15, 8))
+        else:
+            self._ax.clear()
+            plt.figure(self._fig.number)
+        return self._fig, self._ax
     
     def attach_client(self, ict_client):
         """Attach an ICT strategy client to the visualizer"""
@@ -34,51 +46,58 @@ class ICTVisualizer:
             return
         
         # Prepare the plot
-        fig, ax = plt.subplots(figsize=(15, 8))
+        fig, ax = self._figure()
         
         # Format the dates for the x-axis
         dates = pd.to_datetime(df.index)
         
-        # Plot candlesticks manually 
-        for i, (idx, row) in enumerate(df.iterrows()):
-            # Determine candle color
-            if row['close'] >= row['open']:
-                color = 'green'
-                body_bottom = row['open']
-                body_top = row['close']
-            else:
-                color = 'red'
-                body_bottom = row['close']
-                body_top = row['open']
-            
-            # Plot candle body
-            ax.add_patch(plt.Rectangle((i-0.4, body_bottom), 0.8, body_top-body_bottom, fill=True, color=color))
-            
-            # Plot candle wick
-            ax.plot([i, i], [row['low'], row['high']], color='black', linewidth=1)
+        # Plot candlesticks as two batched collections instead of one artist per candle
+        opens = df['open'].to_numpy(dtype=float)
+        closes = df['close'].to_numpy(dtype=float)
+        x = np.arange(len(df))
+        body_bottom = np.minimum(opens, closes)
+        body_top = np.maximum(opens, closes)
+        colors = np.where(closes >= opens, 'green', 'red')
+        
+        # Candle wicks
+        wicks = np.stack([np.column_stack([x, df['low'].to_numpy(dtype=float)]),
+                          np.column_stack([x, df['high'].to_numpy(dtype=float)])], axis=1)
+        ax.add_collection(LineCollection(wicks, colors='black', linewidths=1))
+        
+        # Candle bodies, rasterized so zoom/pan redraws blit a single image
+        verts = np.stack([np.column_stack([x - 0.4, body_bottom]),
+                          np.column_stack([x - 0.4, body_top]),
+                          np.column_stack([x + 0.4, body_top]),
+                          np.column_stack([x + 0.4, body_bottom])], axis=1)
+        pc = PolyCollection(verts, facecolors=colors, edgecolors=colors)
+        pc.set_rasterized(True)
+        ax.add_collection(pc)
+        ax.autoscale_view()
         
         # Plot swing highs and lows if available
         if 'swing_high' in df.columns and 'swing_low' in df.columns:
-            # Swing highs
-            swing_highs = df[df['swing_high'] == True]
-            for i, (idx, row) in enumerate(swing_highs.iterrows()):
-                index_pos = dates.get_loc(idx)
-                ax.scatter(index_pos, row['high'], color='blue', s=100, marker='^')
-                ax.text(index_pos, row['high']*1.01, "H", fontsize=10)
+            # Swing highs, one scatter artist for all of them
+            swing_high = df['swing_high'].to_numpy(dtype=bool)
+            highs = df['high'].to_numpy(dtype=float)[swing_high]
+            ax.scatter(x[swing_high], highs, color='blue', s=100, marker='^')
+            for index_pos, price in zip(x[swing_high], highs):
+                ax.text(index_pos, price*1.01, "H", fontsize=10)
             
             # Swing lows
-            swing_lows = df[df['swing_low'] == True]
-            for i, (idx, row) in enumerate(swing_lows.iterrows()):
-                index_pos = dates.get_loc(idx)
-                ax.scatter(index_pos, row['low'], color='purple', s=100, marker='v')
-                ax.text(index_pos, row['low']*0.99, "L", fontsize=10)
+            swing_low = df['swing_low'].to_numpy(dtype=bool)
+            lows = df['low'].to_numpy(dtype=float)[swing_low]
+            ax.scatter(x[swing_low], lows, color='purple', s=100, marker='v')
+            for index_pos, price in zip(x[swing_low], lows):
+                ax.text(index_pos, price*0.99, "L", fontsize=10)
         
         # Add any fair value gaps if we have an attached client
         if self.client and hasattr(self.client, 'active_fvgs'):
+            # FVGs are keyed on the open time of the candle that created them
+            opened = pd.Index(df['timestamp'])
             for fvg in self.client.active_fvgs:
                 # Find the candle index where this FVG was created
                 try:
-                    idx = dates.get_loc(fvg['created_at'])
+                    idx = opened.get_loc(fvg['created_at'])
                     color = self.colors['bullish_fvg'] if fvg['type'] == 'bullish' else self.colors['bearish_fvg']
                     
                     # Draw a rectangle for the FVG
@@ -121,7 +140,8 @@ class ICTVisualizer:
         plt.tight_layout()
         
         if filename:
-            plt.savefig(filename)
+            # Match the raster layer resolution of the candle bodies
+            plt.savefig(filename, dpi=100)
             print(f"Chart saved to {filename}")
         
         plt.show()
@@ -217,10 +237,11 @@ class ICTVisualizer:
         
         # Basic stats
         total_trades = len(trades)
-        winning_trades = len(trades[trades['profit'] > 0])
-        losing_trades = len(trades[trades['profit'] < 0])
+        profit = trades['profit'].to_numpy(dtype=float)
+        winning_trades = int(np.count_nonzero(profit > 0))
+        losing_trades = int(np.count_nonzero(profit < 0))
         win_rate = (winning_trades / total_trades) * 100
-        avg_profit = trades['profit'].mean() * 100  # Convert to percentage
+        avg_profit = profit.mean() * 100  # Convert to percentage
         
         # Generate HTML
         html = f"""
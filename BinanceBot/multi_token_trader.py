@@ -17,6 +17,7 @@ import json
 from pathlib import Path
 import key
 from trade import ICTTraderClient
+from _client_common import kline_arrays, candle_frame
 
 # Create necessary directories
 os.makedirs('logs', exist_ok=True)
@@ -152,7 +153,7 @@ def bot_status_updater(update_interval=5):
             # Update the dashboard status
             update_bot_status(combined_status)
             
-            logger.info(f"Updated dashboard status for {len(traders)} pairs")
+            logger.debug("Updated dashboard status for %d pairs", len(traders))
             
         except Exception as e:
             logger.error(f"Error updating dashboard status: {e}", exc_info=True)
@@ -160,6 +161,14 @@ def bot_status_updater(update_interval=5):
         # Sleep before next update
         time.sleep(update_interval)
 
+def kline_frame(klines):
+    """Candle DataFrame with datetime timestamps from raw REST klines"""
+    # Parse the OHLCV strings in one NumPy cast; the trailing kline fields are unused
+    timestamps, ohlcv = kline_arrays(klines)
+    df = candle_frame(timestamps, ohlcv)
+    df['timestamp'] = timestamps.astype('datetime64[s]')
+    return df
+
 def initialize_trader(trader, pair):
     """Initialize trader data and mark as ready"""
     try:
@@ -174,22 +183,7 @@ def initialize_trader(trader, pair):
             interval=trader.htf_interval,
             limit=trader.htf_df_length
         )
-        
-        # Import pandas here to avoid circular imports
-        import pandas as pd
-        
-        trader.htf_df = pd.DataFrame(htf_candles, columns=[
-            'timestamp', 'open', 'high', 'low', 'close', 'volume',
-            'close_time', 'quote_asset_volume', 'trades',
-            'taker_buy_base', 'taker_buy_quote', 'ignored'
-        ])
-        
-        # Convert string columns to numeric
-        for col in ['open', 'high', 'low', 'close', 'volume']:
-            trader.htf_df[col] = pd.to_numeric(trader.htf_df[col])
-            
-        # Convert timestamp to datetime
-        trader.htf_df['timestamp'] = pd.to_datetime(trader.htf_df['timestamp'], unit='ms')
+        trader.htf_df = kline_frame(htf_candles)
         
         # Fetch LTF data separately
         logger.info(f"[{pair}] Fetching LTF data")
@@ -198,19 +192,7 @@ def initialize_trader(trader, pair):
             interval=trader.interval,
             limit=trader.df_length
         )
-        
-        trader.df = pd.DataFrame(ltf_candles, columns=[
-            'timestamp', 'open', 'high', 'low', 'close', 'volume',
-            'close_time', 'quote_asset_volume', 'trades',
-            'taker_buy_base', 'taker_buy_quote', 'ignored'
-        ])
-        
-        # Convert string columns to numeric
-        for col in ['open', 'high', 'low', 'close', 'volume']:
-            trader.df[col] = pd.to_numeric(trader.df[col])
-            
-        # Convert timestamp to datetime
-        trader.df['timestamp'] = pd.to_datetime(trader.df['timestamp'], unit='ms')
+        trader.df = kline_frame(ltf_candles)
         
         # Process data for trading
         trader.data_process()
@@ -298,7 +280,7 @@ def run_trader(pair, args):
                 # Sleep to avoid excessive API calls
                 time.sleep(5)
             except Exception as e:
-                logger.error(f"Error in trading loop for {pair}: {e}", exc_info=True)
+                logger.error("Error in trading loop for %s: %s", pair, e, exc_info=True)
                 time.sleep(10)  # Longer sleep on error
         
     except Exception as e:
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+run.py - Single entry point for the Binance bot and dashboard runners
+
+Dispatches to the runner modules, which share their logging and socket
+setup through _runner_common.py:
+
+    python run.py bot --pair BTCBUSD --htf 1h --ltf 5m
+    python run.py ict-bot --visualize
+    python run.py dashboard --pairs BTCBUSD,ETHBUSD --port 8080
+"""
+
+import sys
+import argparse
+import importlib
+
+# Subcommand -> runner module exposing main(argv)
+COMMANDS = {
+    'bot': 'run_bot',
+    'ict-bot': 'run_ict_bot',
+    'dashboard': 'run_dashboard',
+}
+
+
+def main(argv=None):
+    """Parse the subcommand and hand the remaining arguments to its runner"""
+    argv = sys.argv[1:] if argv is None else list(argv)
+
+    parser = argparse.ArgumentParser(
+        description='Run a Binance trading bot component',
+        epilog='Run "run.py <command> --help" for the options of each command.'
+    )
+    parser.add_argument('command', choices=list(COMMANDS),
+                        help='Component to run')
+    args = parser.parse_args(argv[:1])
+
+    # Only the selected runner (and its dependencies) is imported
+    runner = importlib.import_module(COMMANDS[args.command])
+    return runner.main(argv[1:])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
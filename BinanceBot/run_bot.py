@@ -6,38 +6,30 @@ This script serves as a standalone Binance bot runner, handling initialization,
 parameter configuration, and trading execution.
 """
 
-import time
-import sys
-import os
-import logging
+import gc
+import signal
 import argparse
+import functools
+from dataclasses import dataclass
 import key
-from trade import ICTTraderClient
+from _runner_common import setup_logging, handle_sigterm, pin_to_cpus, tune_sockets, uses_default_keys
 
 
-def setup_logging():
-    """Configure logging for the bot"""
-    log_path = "logs"
-    
-    # Ensure log directory exists
-    if not os.path.exists(log_path):
-        os.makedirs(log_path)
-    
-    # Set up logging
-    log_file = os.path.join(log_path, "binance_bot.log")
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s [%(levelname)s] %(message)s",
-        handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
-    return logging.getLogger(__name__)
+@dataclass(frozen=True)
+class BotArgs:
+    """Parsed command line arguments for the bot"""
+    __slots__ = ('pair', 'htf', 'ltf', 'risk', 'min_fvg_size', 'trail')
+    pair: str
+    htf: str
+    ltf: str
+    risk: float
+    min_fvg_size: float
+    trail: float
 
 
-def parse_arguments():
-    """Parse command line arguments"""
+@functools.lru_cache(maxsize=1)
+def parse_arguments(argv=None):
+    """Parse command line arguments once and return them as BotArgs"""
     parser = argparse.ArgumentParser(description='Run the Binance Trading Bot')
     
     parser.add_argument('--pair', type=str, default='BTCBUSD',
@@ -53,28 +45,36 @@ def parse_arguments():
     parser.add_argument('--trail', type=float, default=0.8,
                         help='Trail stop ratio (default: 0.8)')
     
-    return parser.parse_args()
+    return BotArgs(**vars(parser.parse_args(argv)))
 
 
-def main():
+def main(argv=None):
     """Main execution function"""
-    # Set up logging
-    logger = setup_logging()
+    # Set up logging, with the log thread kept off the trading core
+    logger = setup_logging(log_cpu=1)
+    signal.signal(signal.SIGTERM, handle_sigterm)
+    
+    # Keep the trade loop on one core (Linux only)
+    pin_to_cpus({0})
     logger.info("Starting Binance Trading Bot")
     
     # Parse command line arguments
-    args = parse_arguments()
+    args = parse_arguments(None if argv is None else tuple(argv))
+    
+    # Imported after argument parsing so --help does not load pandas/binance
+    from trade import ICTTraderClient
     
     # Check if API keys are set
-    if key.key == "YOUR_API_KEY" or key.secret == "YOUR_API_SECRET":
+    if uses_default_keys(key.key, key.secret):
         logger.warning("You are using default API keys from key.py.")
         logger.warning("Please update the key.py file with your Binance API credentials.")
 
     try:
         # Initialize the Binance client with ICT strategy
-        logger.info(f"Initializing trading client for {args.pair} with HTF: {args.htf}, LTF: {args.ltf}")
+        logger.info("Initializing trading client for %s with HTF: %s, LTF: %s", args.pair, args.htf, args.ltf)
         
         trader = ICTTraderClient(key.key, key.secret)
+        tune_sockets(trader)
         
         # Set up basic parameters
         trader.trade_history = []
@@ -101,13 +101,16 @@ def main():
         # Initialize and start trading
         logger.info("Starting trading process")
         trader.update()
-        time.sleep(0.3)
+        # Move the long-lived startup objects out of the collected generations
+        gc.freeze()
+        # Wait until update() has loaded candle data instead of a fixed delay
+        trader.data_ready.wait(timeout=5.0)
         trader.start()
     
     except KeyboardInterrupt:
         logger.info("Bot manually stopped by user")
     except Exception as e:
-        logger.error(f"Error in trading bot: {e}", exc_info=True)
+        logger.error("Error in trading bot: %s", e, exc_info=True)
 
 
 if __name__ == "__main__":
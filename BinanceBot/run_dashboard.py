@@ -12,8 +12,11 @@ import sys
 import argparse
 import logging
 import threading
-import datetime
-from dashboard import app, update_bot_status, update_pair_status, bot_status, pair_status, add_trade
+import signal
+import atexit
+import functools
+import numpy as np
+from _runner_common import now_str
 
 # Configure logging
 logging.basicConfig(
@@ -26,7 +29,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def parse_arguments():
+# Set to stop the background update thread
+_stop = threading.Event()
+
+def parse_arguments(argv=None):
     """Parse command line arguments"""
     parser = argparse.ArgumentParser(description='Run Trading Bot Dashboard')
     
@@ -41,11 +47,75 @@ def parse_arguments():
     parser.add_argument('--btc-price', type=float, default=90000.0,
                         help='Current BTC price for demo (default: 90000.0)')
     
-    return parser.parse_args()
+    return parser.parse_args(argv)
+
+# Demo status per pair; pairs without an entry use '_DEFAULT'
+_PAIR_DEFAULTS = {
+    'BTCBUSD': {
+        'base_balance': 500.0,
+        'asset_balance': 0.01,
+        'market_bias': 'Bullish',
+        'active_fvgs': 2,
+        'position_open': True,
+        'total_trades': 8,
+        'win_rate': 62.5,
+        'avg_profit': 1.8,
+        'total_value': 800.0
+    },
+    'ETHBUSD': {
+        'base_balance': 200.0,
+        'asset_balance': 0.0,
+        'market_bias': 'Bearish',
+        'active_fvgs': 1,
+        'position_open': False,
+        'total_trades': 5,
+        'win_rate': 60.0,
+        'avg_profit': 1.5,
+        'total_value': 200.0
+    },
+    '_DEFAULT': {
+        'base_balance': 200.0,
+        'asset_balance': 0.0,
+        'market_bias': 'Neutral',
+        'active_fvgs': 0,
+        'position_open': False,
+        'total_trades': 2,
+        'win_rate': 50.0,
+        'avg_profit': 0.8,
+        'total_value': 0.0
+    }
+}
+
+# Demo price by asset found in the pair name, checked in order
+_ASSET_PRICES = (('ETH', 3800.0), ('BNB', 600.0))
+
+@functools.lru_cache(maxsize=None)
+def demo_price(pair, btc_price):
+    """Return the demo price for a pair"""
+    if 'BTC' in pair:
+        return btc_price
+    for asset, price in _ASSET_PRICES:
+        if asset in pair:
+            return price
+    return 100.0
+
+# Columnar copies of the per-pair fields aggregated into bot_status
+MAX_PAIRS = 256
+_pair_idx = {}
+_total_value = np.zeros(MAX_PAIRS, dtype=np.float64)
+_total_trades = np.zeros(MAX_PAIRS, dtype=np.int32)
+_position_open = np.zeros(MAX_PAIRS, dtype=bool)
+
+def index_pair(pair, status):
+    """Store a pair's aggregated fields in the columnar arrays"""
+    i = _pair_idx.setdefault(pair, len(_pair_idx))
+    _total_value[i] = status.get('total_value', 0.0)
+    _total_trades[i] = status.get('total_trades', 0)
+    _position_open[i] = status.get('position_open', False)
 
 def update_demo_data(args):
     """Update demo data based on command-line arguments"""
-    global bot_status, pair_status
+    from dashboard import bot_status, pair_status, publish_status
     
     # Get pairs from command line
     pairs = [pair.strip() for pair in args.pairs.split(',')]
@@ -54,82 +124,93 @@ def update_demo_data(args):
     bot_status['is_running'] = True
     bot_status['strategy'] = args.strategy
     bot_status['pairs'] = pairs
-    bot_status['last_update'] = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    bot_status['last_update'] = now_str()
     
     # Set up demo pair status for each pair
-    total_value = 0
-    total_trades = 0
-    active_positions = 0
-    
     for pair in pairs:
         if pair not in pair_status:
-            pair_status[pair] = {
-                'trading_pair': pair,
-                'base_balance': 500.0 if pair == 'BTCBUSD' else 200.0,
-                'asset_balance': 0.01 if pair == 'BTCBUSD' else 0.0,
-                'current_price': args.btc_price if 'BTC' in pair else 
-                                3800.0 if 'ETH' in pair else 
-                                600.0 if 'BNB' in pair else 
-                                100.0,
-                'market_bias': 'Bullish' if pair == 'BTCBUSD' else 'Bearish' if pair == 'ETHBUSD' else 'Neutral',
-                'active_fvgs': 2 if pair == 'BTCBUSD' else 1 if pair == 'ETHBUSD' else 0,
-                'position_open': True if pair == 'BTCBUSD' else False,
-                'total_trades': 8 if pair == 'BTCBUSD' else 5 if pair == 'ETHBUSD' else 2,
-                'win_rate': 62.5 if pair == 'BTCBUSD' else 60.0 if pair == 'ETHBUSD' else 50.0,
-                'avg_profit': 1.8 if pair == 'BTCBUSD' else 1.5 if pair == 'ETHBUSD' else 0.8,
-                'total_value': 800.0 if pair == 'BTCBUSD' else 200.0 if pair == 'ETHBUSD' else 0.0
-            }
+            status = _PAIR_DEFAULTS.get(pair, _PAIR_DEFAULTS['_DEFAULT']).copy()
+            status['trading_pair'] = pair
+            status['current_price'] = demo_price(pair, args.btc_price)
+            pair_status[pair] = status
         
-        total_value += pair_status[pair]['total_value']
-        total_trades += pair_status[pair]['total_trades']
-        if pair_status[pair]['position_open']:
-            active_positions += 1
+        index_pair(pair, pair_status[pair])
     
     # Update bot status with aggregated data
-    bot_status['total_value'] = total_value
-    bot_status['total_trades'] = total_trades
+    n = len(_pair_idx)
+    bot_status['total_value'] = float(_total_value[:n].sum())
+    bot_status['total_trades'] = int(_total_trades[:n].sum())
     bot_status['win_rate'] = 60.0  # Average win rate
-    bot_status['active_positions'] = active_positions
+    bot_status['active_positions'] = int(_position_open[:n].sum())
+    publish_status()
 
 def update_real_time_data():
     """Update real-time data from the Binance API (demo for now)"""
+    from dashboard import bot_status, publish_status
+    
     # This would be replaced with actual API calls in production
     # For now, we just update the timestamp
-    bot_status['last_update'] = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    bot_status['last_update'] = now_str()
+    
+    # Publish through dashboard so the ETag version and the status stream move too
+    publish_status()
     
     # In a real implementation, we would:
-    # 1. Fetch current prices from Binance
+    # 1. Fetch current prices from Binance with a single batched
+    #    GET /api/v3/ticker/price?symbols=[...] call rather than one per pair
     # 2. Update position status
     # 3. Calculate portfolio value
     # 4. Update market bias based on analysis
 
-def main():
+def update_thread():
+    """Background loop refreshing real-time data every 5 seconds until stopped"""
+    while not _stop.wait(5):
+        try:
+            update_real_time_data()
+        except Exception as e:
+            logger.error("Error updating data: %s", e, exc_info=True)
+
+def _handle_sigint(signum, frame):
+    """Signal the update thread to exit and re-raise KeyboardInterrupt"""
+    _stop.set()
+    signal.default_int_handler(signum, frame)
+
+def main(argv=None):
     """Main execution function"""
     # Parse command line arguments
-    args = parse_arguments()
+    args = parse_arguments(argv)
+    
+    # Imported after argument parsing so --help does not load Flask
+    from dashboard import app, bot_status, enable_fast_json, MAX_STREAMS, load_saved_state, save_state
+    
+    # Reuse the state of a run that exited moments ago, and save ours on exit
+    load_saved_state()
+    atexit.register(save_state)
     
     # Update demo data based on command-line arguments
     update_demo_data(args)
     
-    # Create a background thread to periodically update data
-    def update_thread():
-        while True:
-            try:
-                update_real_time_data()
-                threading.Event().wait(5)  # Update every 5 seconds
-            except Exception as e:
-                logger.error(f"Error updating data: {e}", exc_info=True)
+    # Stop the update thread on Ctrl-C, then let Flask handle the interrupt as before
+    signal.signal(signal.SIGINT, _handle_sigint)
     
     # Start update thread
     threading.Thread(target=update_thread, daemon=True).start()
     
     # Start the dashboard
-    logger.info(f"Starting web dashboard on port {args.port} with strategy: {args.strategy}")
-    logger.info(f"Monitoring pairs: {', '.join(bot_status['pairs'])}")
+    logger.info("Starting web dashboard on port %s with strategy: %s", args.port, args.strategy)
+    logger.info("Monitoring pairs: %s", ', '.join(bot_status['pairs']))
     print(f"Dashboard available at: http://localhost:{args.port}/")
     
-    # Run the Flask app
-    app.run(host='0.0.0.0', port=args.port, debug=args.debug)
+    enable_fast_json(app)
+    
+    # Run the Flask app; the debug server is single-threaded, so serve
+    # through waitress's thread pool unless debugging. Open status streams
+    # each hold a worker, so they get threads on top of the 8 for requests
+    if args.debug:
+        app.run(host='0.0.0.0', port=args.port, debug=True)
+    else:
+        from waitress import serve
+        serve(app, host='0.0.0.0', port=args.port, threads=8 + MAX_STREAMS, connection_limit=256)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
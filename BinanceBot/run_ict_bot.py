@@ -6,38 +6,14 @@ This script serves as a standalone runner for the ICT strategy, with added
 visualization capabilities and real-time strategy analysis.
 """
 
-import time
-import sys
 import os
-import logging
+import signal
 import argparse
 import key
-from trade import ICTTraderClient
-from ict_visualization import ICTVisualizer
+from _runner_common import setup_logging, handle_sigterm, tune_sockets, uses_default_keys
 
 
-def setup_logging():
-    """Configure logging for the ICT bot"""
-    log_path = "logs"
-    
-    # Ensure log directory exists
-    if not os.path.exists(log_path):
-        os.makedirs(log_path)
-    
-    # Set up logging
-    log_file = os.path.join(log_path, "ict_bot.log")
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s [%(levelname)s] %(message)s",
-        handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
-    return logging.getLogger(__name__)
-
-
-def parse_arguments():
+def parse_arguments(argv=None):
     """Parse command line arguments"""
     parser = argparse.ArgumentParser(description='Run the ICT Strategy Bot')
     
@@ -56,28 +32,36 @@ def parse_arguments():
     parser.add_argument('--visualize', action='store_true',
                         help='Enable visualization (saves charts)')
     
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
-def main():
+def main(argv=None):
     """Main execution function"""
     # Set up logging
-    logger = setup_logging()
+    logger = setup_logging("ict_bot.log")
+    signal.signal(signal.SIGTERM, handle_sigterm)
     logger.info("Starting ICT Strategy Bot")
     
     # Parse command line arguments
-    args = parse_arguments()
+    args = parse_arguments(argv)
+    
+    # Imported after argument parsing so --help does not load pandas/binance
+    # (or matplotlib, unless visualization is requested)
+    from trade import ICTTraderClient
+    if args.visualize:
+        from ict_visualization import ICTVisualizer
     
     # Check if API keys are set
-    if key.key == "YOUR_API_KEY" or key.secret == "YOUR_API_SECRET":
+    if uses_default_keys(key.key, key.secret):
         logger.warning("You are using default API keys from key.py.")
         logger.warning("Please update the key.py file with your Binance API credentials.")
 
     try:
         # Initialize the ICT strategy client
-        logger.info(f"Initializing ICT strategy for {args.pair} with HTF: {args.htf}, LTF: {args.ltf}")
+        logger.info("Initializing ICT strategy for %s with HTF: %s, LTF: %s", args.pair, args.htf, args.ltf)
         
         trader = ICTTraderClient(key.key, key.secret)
+        tune_sockets(trader)
         
         # Set up basic parameters
         trader.trade_history = []
@@ -117,11 +101,12 @@ def main():
         # Show initial market structure if visualization is enabled
         if args.visualize:
             visualizer.plot_market_structure(save_path=f"charts/market_structure_{args.pair}_{args.htf}.png")
-            logger.info(f"Initial market structure chart saved to charts/market_structure_{args.pair}_{args.htf}.png")
+            logger.info("Initial market structure chart saved to charts/market_structure_%s_%s.png", args.pair, args.htf)
         
         # Start trading
         logger.info("Starting trading process")
-        time.sleep(0.3)
+        # Wait until update() has loaded candle data instead of a fixed delay
+        trader.data_ready.wait(timeout=5.0)
         trader.start()
     
     except KeyboardInterrupt:
@@ -133,12 +118,12 @@ def main():
                 visualizer = ICTVisualizer(trader)
                 report_path = f"charts/trade_report_{args.pair}_{args.ltf}.html"
                 visualizer.create_trade_report(filename=report_path)
-                logger.info(f"Trade report generated: {report_path}")
+                logger.info("Trade report generated: %s", report_path)
             except Exception as e:
-                logger.error(f"Error generating trade report: {e}")
+                logger.error("Error generating trade report: %s", e)
     
     except Exception as e:
-        logger.error(f"Error in ICT strategy bot: {e}", exc_info=True)
+        logger.error("Error in ICT strategy bot: %s", e, exc_info=True)
 
 
 if __name__ == "__main__":
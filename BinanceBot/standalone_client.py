@@ -4,16 +4,30 @@ Standalone Binance Client
 This is a version of BinanceClient that doesn't depend on PySide2.
 """
 
-from binance.client import Client
+from binance.streams import ThreadedWebsocketManager
 import pandas as pd
-import matplotlib.pyplot as plt
 import os
+import sys
+import matplotlib
+# Headless Linux (no X display): render straight to PNG
+if sys.platform.startswith('linux') and not os.environ.get("DISPLAY"):
+    matplotlib.use('Agg')
+import matplotlib.pyplot as plt
 import numpy as np
 import ta
 import time
 import math
 import datetime
 import threading
+try:
+    from _indicators import indicators_tail
+    from _client_common import FastJSONClient, free_balances, book_ticker
+    from _backtest import backtest_grid
+except ImportError:
+    # imported as BinanceBot.standalone_client from the project root
+    from ._indicators import indicators_tail
+    from ._client_common import FastJSONClient, free_balances, book_ticker
+    from ._backtest import backtest_grid
 
 class BinanceClient:
     def __init__(self, api_key, api_secret):
@@ -55,37 +69,27 @@ class BinanceClient:
         self.plot = False
 
         self.trading_delay = 0.5
-        self.client = Client(self.api_key, self.api_secret)
+        self.client = FastJSONClient(self.api_key, self.api_secret)
         self.update_time = 0
         self.balances = {}
         self.tickers = {}
+        # self.df is only ever rebound to a finished DataFrame, never modified
+        # in place, so readers take one local reference and need no lock
         self.df = pd.DataFrame()
+        # Indicator values and RSI state from the previous get_candles call
+        self._indicator_cache = None
 
-        # Create a data update thread
-        self.data_thread = None
-        self._stop_event = threading.Event()
+        # Line-buffered order/position logs, kept open for the client's lifetime
+        self._order_fp = open("order.log", "a", buffering=1)
+        self._position_fp = open("position.log", "a", buffering=1)
+        # Log line prefix, formatted at most once per wall-clock second
+        self._last_ts_int = 0
+        self._last_ts_str = ""
 
-    def start_data_thread(self):
-        """Start a thread to update data periodically"""
-        self._stop_event.clear()
-        self.data_thread = threading.Thread(target=self._data_loop)
-        self.data_thread.daemon = True
-        self.data_thread.start()
-
-    def stop_data_thread(self):
-        """Stop the data update thread"""
-        if self.data_thread:
-            self._stop_event.set()
-            self.data_thread.join()
-
-    def _data_loop(self):
-        """Background thread to update data"""
-        while not self._stop_event.is_set():
-            try:
-                self.update()
-            except Exception as e:
-                print(f"Error in data loop: {str(e)}")
-            time.sleep(0.8)
+        # Websocket streams keep balances, tickers and candles current
+        self.twm = None
+        # Set by stop(); waiting on it keeps shutdown immediate
+        self._stop_event = threading.Event()
 
     def reset_position(self):
         self.position_data = {
@@ -109,13 +113,7 @@ class BinanceClient:
 
         self.update_time = time.time()
 
-        balance = binance_info['balances']
-
-        balances = {}
-        for i in balance:
-            if float(i["free"]) > 0.0:
-                balances[i["asset"]] = float(i["free"])
-        self.balances = balances
+        self.balances = free_balances(binance_info)
 
         # get bid & ask price
         try:
@@ -124,23 +122,22 @@ class BinanceClient:
             print(f"Cannot get ticker info from binance: {str(e)}")
             return
 
-        for i in tickers:
-            if i["symbol"] == self.pair:
-                self.tickers[self.pair] = {"ask": float(i["askPrice"]), "bid": float(i["bidPrice"])}
+        ticker = book_ticker(tickers, self.pair)
+        if ticker is not None:
+            self.tickers[self.pair] = ticker
 
         self.df = self.get_candles()
 
     def trade_init(self):
-        self.update()
-        self.start_data_thread()
-        time.sleep(0.5)
+        self.start()
 
     def trade_loop(self):
         print("BinanceClient.trade()")
 
-        while True:
+        while not self._stop_event.is_set():
             if self.mode == "trade":
-                time.sleep(self.trading_delay)
+                if self._stop_event.wait(self.trading_delay):
+                    break
                 self.data_process()
                 self.manager()
 
@@ -164,59 +161,171 @@ class BinanceClient:
                 limit=self.df_length
             )
             
-            # Convert to DataFrame
-            df = pd.DataFrame(klines, columns=[
-                'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                'close_time', 'quote_asset_volume', 'number_of_trades',
-                'taker_buy_base_asset_volume', 'taker_buy_quote_asset_volume', 'ignore'
-            ])
+            if not klines:
+                return pd.DataFrame()
             
-            # Convert string values to float
-            df['open'] = df['open'].astype(float)
-            df['high'] = df['high'].astype(float)
-            df['low'] = df['low'].astype(float)
-            df['close'] = df['close'].astype(float)
-            df['volume'] = df['volume'].astype(float)
+            # Parse the columns we use straight into typed arrays; the
+            # remaining kline fields (close_time, quote volume, ...) are dropped
+            arr = np.array(klines, dtype=object)
+            df = pd.DataFrame({
+                'timestamp': arr[:, 0].astype(np.int64).view('datetime64[ms]'),
+                'open': arr[:, 1].astype(np.float64),
+                'high': arr[:, 2].astype(np.float64),
+                'low': arr[:, 3].astype(np.float64),
+                'close': arr[:, 4].astype(np.float64),
+                'volume': arr[:, 5].astype(np.float64)
+            })
             
-            # Convert timestamp to datetime
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+            self.add_indicators(df)
             
             return df
         except Exception as e:
             print(f"Error getting candles: {str(e)}")
             return pd.DataFrame()
 
+    def add_indicators(self, df):
+        """Add sma_20, sma_50 and rsi columns to a fresh candle DataFrame
+
+        Successive fetches overlap except for the newest bars, so values for
+        bars that were already closed at the previous fetch are copied from
+        the cache and only the remaining bars are computed. The last bar is
+        still forming, so the cached RSI state stops one bar before it.
+        """
+        close = df['close'].to_numpy(dtype=np.float64)
+        timestamps = df['timestamp'].to_numpy()
+        n = len(close)
+        sma_20 = np.full(n, np.nan)
+        sma_50 = np.full(n, np.nan)
+        rsi = np.full(n, np.nan)
+        
+        start = 0
+        avg_gain, avg_loss, count = 0.0, 0.0, 0
+        cache = self._indicator_cache
+        if cache is not None and cache['key'] == (self.pair, self.interval) and n > 1:
+            cached_ts = cache['timestamps']
+            offset = np.searchsorted(cached_ts, timestamps[0])
+            last_closed = len(cached_ts) - 2
+            overlap = last_closed - offset + 1
+            if (0 < overlap < n and cached_ts[offset] == timestamps[0]
+                    and cached_ts[last_closed] == timestamps[overlap - 1]):
+                sma_20[:overlap] = cache['sma_20'][offset:last_closed + 1]
+                sma_50[:overlap] = cache['sma_50'][offset:last_closed + 1]
+                rsi[:overlap] = cache['rsi'][offset:last_closed + 1]
+                avg_gain, avg_loss, count = cache['rsi_state']
+                start = overlap
+        
+        rsi_state = indicators_tail(close, sma_20, sma_50, rsi, start, avg_gain, avg_loss, count)
+        
+        self._indicator_cache = {
+            'key': (self.pair, self.interval),
+            'timestamps': timestamps,
+            'sma_20': sma_20,
+            'sma_50': sma_50,
+            'rsi': rsi,
+            'rsi_state': rsi_state
+        }
+        
+        df['sma_20'] = sma_20
+        df['sma_50'] = sma_50
+        df['rsi'] = rsi
+
     def start(self):
-        """Start the client"""
-        self.running = True
-        self.thread = threading.Thread(target=self._update_loop)
-        self.thread.daemon = True
-        self.thread.start()
+        """Start the client
+
+        One REST update fetches the initial snapshot; after that the kline,
+        user data and book ticker streams push changes as they happen.
+        """
+        self._stop_event.clear()
+        self.update()
+        self.twm = ThreadedWebsocketManager(api_key=self.api_key, api_secret=self.api_secret)
+        self.twm.start()
+        self.twm.start_kline_socket(callback=self._on_kline, symbol=self.pair, interval=self.interval)
+        self.twm.start_user_socket(callback=self._on_user)
+        self.twm.start_symbol_book_ticker_socket(callback=self._on_book_ticker, symbol=self.pair)
         
     def stop(self):
         """Stop the client"""
-        self.running = False
-        if self.thread:
-            self.thread.join(timeout=2.0)
-            
-    def _update_loop(self):
-        """Background update loop"""
-        while self.running:
-            try:
-                self.update()
-            except Exception as e:
-                print(f"Error in update loop: {str(e)}")
-            time.sleep(1.0)
+        self._stop_event.set()
+        if self.twm:
+            self.twm.stop()
+            self.twm = None
+
+    def _on_kline(self, msg):
+        """Update or append the streamed candle and refresh the indicators"""
+        if msg.get('e') != 'kline':
+            print(f"Error in kline stream: {msg.get('m', msg)}")
+            return
+        k = msg['k']
+        df = self.df
+        if df is None or df.empty:
+            return
+        
+        timestamp = pd.to_datetime(k['t'], unit='ms')
+        last = df['timestamp'].iloc[-1]
+        if timestamp < last:
+            return
+        
+        row = {
+            'open': float(k['o']),
+            'high': float(k['h']),
+            'low': float(k['l']),
+            'close': float(k['c']),
+            'volume': float(k['v'])
+        }
+        if timestamp == last:
+            df = df.copy()
+            for column, value in row.items():
+                df.iloc[-1, df.columns.get_loc(column)] = value
+        else:
+            row['timestamp'] = timestamp
+            df = pd.concat([df, pd.DataFrame([row])], ignore_index=True)
+            df = df.iloc[-self.df_length:].reset_index(drop=True)
+        
+        self.add_indicators(df)
+        self.update_time = time.time()
+        # Publish the finished frame in one assignment
+        self.df = df
+
+    def _on_user(self, msg):
+        """Apply balance changes from the user data stream"""
+        if msg.get('e') != 'outboundAccountPosition':
+            return
+        balances = dict(self.balances)
+        for i in msg['B']:
+            free = float(i['f'])
+            if free > 0.0:
+                balances[i['a']] = free
+            else:
+                balances.pop(i['a'], None)
+        self.balances = balances
+
+    def _on_book_ticker(self, msg):
+        """Keep the best bid & ask of the traded pair"""
+        if msg.get('s') != self.pair:
+            return
+        self.tickers[self.pair] = {"ask": float(msg['a']), "bid": float(msg['b'])}
+
+    def close(self):
+        """Stop the client and close the order/position logs"""
+        self.stop()
+        self._order_fp.close()
+        self._position_fp.close()
+
+    def _log_timestamp(self):
+        """Current local time in ISO format, reformatted only when the second changes"""
+        now = int(time.time())
+        if now != self._last_ts_int:
+            self._last_ts_str = datetime.datetime.fromtimestamp(now).isoformat()
+            self._last_ts_int = now
+        return self._last_ts_str
 
     def write_order(self, text):
         """Log order information"""
-        with open("order.log", "a") as f:
-            f.write(f"{datetime.datetime.now()} - {text}\n")
+        self._order_fp.write(f"{self._log_timestamp()} - {text}\n")
             
     def write_position(self, text):
         """Log position information"""
-        with open("position.log", "a") as f:
-            f.write(f"{datetime.datetime.now()} - {text}\n")
+        self._position_fp.write(f"{self._log_timestamp()} - {text}\n")
             
     def buy(self):
         """Execute buy order"""
@@ -243,28 +352,34 @@ class BinanceClient:
         
     def analyse_data(self):
         """Analyze market data for trading signals"""
-        if self.df is None or len(self.df) < 50:
-            return
-            
         df = self.df
+        if df is None or len(df) < 50:
+            return
+        
+        s20 = df['sma_20'].to_numpy()
+        s50 = df['sma_50'].to_numpy()
+        rsi = df['rsi'].to_numpy()
+        # Indicators are not warmed up yet
+        if np.isnan(s20[-2]) or np.isnan(s50[-2]):
+            return None
         
         # Simple moving average crossover strategy
-        if df['sma_20'].iloc[-1] > df['sma_50'].iloc[-1] and df['sma_20'].iloc[-2] <= df['sma_50'].iloc[-2]:
+        if s20[-1] > s50[-1] and s20[-2] <= s50[-2]:
             # Bullish crossover
             print("Bullish signal detected")
             return "buy"
             
-        elif df['sma_20'].iloc[-1] < df['sma_50'].iloc[-1] and df['sma_20'].iloc[-2] >= df['sma_50'].iloc[-2]:
+        elif s20[-1] < s50[-1] and s20[-2] >= s50[-2]:
             # Bearish crossover
             print("Bearish signal detected")
             return "sell"
             
         # RSI overbought/oversold
-        if df['rsi'].iloc[-1] < 30:
+        if rsi[-1] < 30:
             print("Oversold signal detected")
             return "buy"
             
-        if df['rsi'].iloc[-1] > 70:
+        if rsi[-1] > 70:
             print("Overbought signal detected")
             return "sell"
             
@@ -274,64 +389,87 @@ class BinanceClient:
         """Backtesting loop"""
         print("Starting backtesting...")
         
-        if self.df is None or len(self.df) < 50:
+        df = self.df
+        if df is None or len(df) < 50:
             print("Not enough data for backtesting")
             return
             
         # Reset for backtesting
         self.reset_position()
-        self.equity = [1000]  # Starting equity
         
-        trades = []
+        # Simple moving average crossover strategy, detected for all bars at once:
+        # bullish[i - 1] / bearish[i - 1] is a crossover between bars i - 1 and i
+        close = df['close'].to_numpy()
+        times = df['timestamp'].to_numpy().astype('datetime64[ns]').view('i8')
+        epochs = times / 1e9
+        sma_20 = df['sma_20'].to_numpy()
+        sma_50 = df['sma_50'].to_numpy()
+        bullish = (sma_20[1:] > sma_50[1:]) & (sma_20[:-1] <= sma_50[:-1])
+        bearish = (sma_20[1:] < sma_50[1:]) & (sma_20[:-1] >= sma_50[:-1])
         
-        for i in range(50, len(self.df)):
-            # Create a slice of data up to current point
-            current_df = self.df.iloc[:i+1]
-            
-            # Simple moving average crossover strategy
-            sma_20 = current_df['sma_20'].iloc[-1]
-            sma_50 = current_df['sma_50'].iloc[-1]
-            sma_20_prev = current_df['sma_20'].iloc[-2]
-            sma_50_prev = current_df['sma_50'].iloc[-2]
-            
-            price = current_df['close'].iloc[-1]
-            timestamp = current_df['timestamp'].iloc[-1]
+        # Only walk the bars where a crossover happens, starting from bar 50
+        events = np.flatnonzero(bullish | bearish) + 1
+        events = events[events >= 50]
+        
+        # One row per trade: side 0 = buy, 1 = sell; t in ns since the epoch
+        trades = np.empty(len(events), dtype=[('side', 'i1'), ('t', 'i8'), ('p', 'f8')])
+        n_trades = 0
+        
+        for i in events:
+            price = close[i]
+            epoch = epochs[i]
             
-            if sma_20 > sma_50 and sma_20_prev <= sma_50_prev and not self.position:
+            if bullish[i - 1] and not self.position:
                 # Bullish crossover - buy
-                self.open_position(timestamp.timestamp(), price)
-                trades.append(("buy", timestamp, price))
+                self.open_position(epoch, price)
+                trades[n_trades] = (0, times[i], price)
+                n_trades += 1
                 
-            elif sma_20 < sma_50 and sma_20_prev >= sma_50_prev and self.position:
+            elif bearish[i - 1] and self.position:
                 # Bearish crossover - sell
-                profit = price - self.position_price
-                self.equity.append(self.equity[-1] + profit)
-                self.close_position(timestamp.timestamp(), price)
-                trades.append(("sell", timestamp, price))
+                self.close_position(epoch, price)
+                trades[n_trades] = (1, times[i], price)
+                n_trades += 1
+        trades = trades[:n_trades]
+        
+        # Equity curve from the starting 1000, one point per closed trade
+        entry_prices = trades['p'][trades['side'] == 0]
+        exit_prices = trades['p'][trades['side'] == 1]
+        profits = exit_prices - entry_prices[:len(exit_prices)]
+        self.equity = np.concatenate(([1000.0], 1000.0 + np.cumsum(profits)))
                 
         # Plot results
-        self.plot_backtest_results(trades)
+        self.plot_backtest_results(trades, df)
+        
+    def backtest_grid(self, sma_fast_range, sma_slow_range, rsi_buy_range, rsi_sell_range):
+        """Backtest every parameter combination on the current candles in parallel
+
+        Returns the final equities, shape (fast, slow, rsi_buy, rsi_sell).
+        """
+        df = self.df
+        return backtest_grid(df['close'].to_numpy(), sma_fast_range, sma_slow_range,
+                             rsi_buy_range, rsi_sell_range)
         
-    def plot_backtest_results(self, trades):
+    def plot_backtest_results(self, trades, df=None):
         """Plot backtesting results"""
-        if self.df is None or len(self.df) < 2:
+        if df is None:
+            df = self.df
+        if df is None or len(df) < 2:
             return
             
         fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(15, 10), gridspec_kw={'height_ratios': [3, 1]})
         
         # Plot price and moving averages
-        ax1.plot(self.df['timestamp'], self.df['close'], label='Price')
-        ax1.plot(self.df['timestamp'], self.df['sma_20'], label='SMA 20')
-        ax1.plot(self.df['timestamp'], self.df['sma_50'], label='SMA 50')
+        ax1.plot(df['timestamp'], df['close'], label='Price')
+        ax1.plot(df['timestamp'], df['sma_20'], label='SMA 20')
+        ax1.plot(df['timestamp'], df['sma_50'], label='SMA 50')
         
         # Plot buy/sell signals
-        buy_times = [trade[1] for trade in trades if trade[0] == 'buy']
-        buy_prices = [trade[2] for trade in trades if trade[0] == 'buy']
-        sell_times = [trade[1] for trade in trades if trade[0] == 'sell']
-        sell_prices = [trade[2] for trade in trades if trade[0] == 'sell']
+        buys = trades[trades['side'] == 0]
+        sells = trades[trades['side'] == 1]
         
-        ax1.scatter(buy_times, buy_prices, marker='^', color='green', s=100, label='Buy')
-        ax1.scatter(sell_times, sell_prices, marker='v', color='red', s=100, label='Sell')
+        ax1.scatter(buys['t'].astype('datetime64[ns]'), buys['p'], marker='^', color='green', s=100, label='Buy')
+        ax1.scatter(sells['t'].astype('datetime64[ns]'), sells['p'], marker='v', color='red', s=100, label='Sell')
         
         ax1.set_title('Backtest Results')
         ax1.set_ylabel('Price')
@@ -339,7 +477,7 @@ class BinanceClient:
         ax1.grid(True)
         
         # Plot equity curve
-        equity_times = self.df['timestamp'].iloc[50:50+len(self.equity)]
+        equity_times = df['timestamp'].iloc[50:50+len(self.equity)]
         ax2.plot(equity_times, self.equity, label='Equity')
         ax2.set_xlabel('Time')
         ax2.set_ylabel('Equity')
@@ -349,4 +487,6 @@ class BinanceClient:
         plt.tight_layout()
         plt.savefig('backtest_results.png')
         print("Backtest results saved to backtest_results.png")
-        plt.show() 
\ No newline at end of file
+        if self.plot:
+            plt.show()
+        plt.close(fig) 
\ No newline at end of file
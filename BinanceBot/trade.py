@@ -1,28 +1,38 @@
 from BinanceClient import BinanceClient
+from _ict import SwingTracker, liquidity_sweeps, fair_value_gaps, FVGTable, market_structure
 import key
 import time, datetime
 import pandas as pd
 import numpy as np
 import ta
 import sys
+import logging
+
+# per-tick status lines are logged lazily; detections and trades are printed
+logger = logging.getLogger(__name__)
 
 
 class LoggingPrinter:
     def __init__(self):
         self.old_stdout = sys.stdout
+        # Opened once and line buffered instead of reopened on every write
+        self.out_file = open("trade_py.log", 'a', buffering=1)
         sys.stdout = self
     
     def write(self, text):
-        self.out_file = open("trade_py.log", 'a')
         self.old_stdout.write(text)
         self.out_file.write(text)
-        self.out_file.close()
+    
+    def flush(self):
+        self.old_stdout.flush()
+        self.out_file.flush()
     
     def __enter__(self):
         return self
     
     def __exit__(self, type, value, traceback):
         sys.stdout = self.old_stdout
+        self.out_file.close()
 
 
 class ICTTraderClient(BinanceClient):
@@ -41,13 +51,16 @@ class ICTTraderClient(BinanceClient):
         
         # Strategy state variables
         self.htf_bias = None        # 'bullish' or 'bearish'
-        self.active_fvgs = []       # List of active FVGs
+        self.active_fvgs = FVGTable()  # Active FVGs, one array per field
+        self._htf_swings = SwingTracker()
+        self._ohlc = (None, None)
         self.pending_orders = []    # List of pending orders for FVG retests
         self.last_liquidity_sweep = None
         
         # Data frames
         self.htf_df = None         # Higher timeframe dataframe
         self.ltf_df = None         # Lower timeframe dataframe
+        self._processed = None     # (ltf_df, htf_df) last run through data_process
         
         # Risk management
         self.risk_per_trade = 0.01  # 1% risk per trade
@@ -56,23 +69,18 @@ class ICTTraderClient(BinanceClient):
     
     def update(self):
         """Override the update method to fetch both timeframes"""
-        super().update()  # Call parent's update first
+        # Get HTF data, fetching only candles newer than the last update,
+        # while the parent's update fetches account, tickers and LTF data
+        htf = self._fetch_pool.submit(self.update_candles, self.htf_interval, self.htf_df_length)
+        super().update()
 
         # Store the current LTF dataframe
-        self.ltf_df = self.df.copy()
-        
-        # Get HTF data
-        original_interval = self.interval
-        original_df_length = self.df_length
-        
-        self.interval = self.htf_interval
-        self.df_length = self.htf_df_length
+        # self.df is rebound, never written in place, and the LTF steps only
+        # read from it, so no copy is needed; the HTF frames that get swing
+        # columns are built fresh by update_candles
+        self.ltf_df = self.df
         
-        self.htf_df = self.get_candles()
-        
-        # Restore original settings
-        self.interval = original_interval
-        self.df_length = original_df_length
+        self.htf_df = htf.result()
         
         # Process both dataframes
         self.data_process()
@@ -81,6 +89,13 @@ class ICTTraderClient(BinanceClient):
         """Process both timeframes"""
         if self.ltf_df is None or self.htf_df is None:
             return
+        
+        # update() and trade_loop both call this; the frames are only ever
+        # rebound, so identical objects mean there is nothing new to process
+        frames = (self.ltf_df, self.htf_df)
+        if self._processed is not None and all(a is b for a, b in zip(frames, self._processed)):
+            return
+        self._processed = frames
             
         # Process higher timeframe for market structure bias
         self.process_htf_data()
@@ -99,67 +114,32 @@ class ICTTraderClient(BinanceClient):
         self.htf_bias = self.determine_market_structure(df)
         
         # Log the current bias
-        print(f"HTF Bias: {self.htf_bias}")
+        logger.info("HTF Bias: %s", self.htf_bias)
+    
+    def ohlc(self, df):
+        """open, high, low and close of df as NumPy arrays, converted once per frame"""
+        # Frames are rebound on update, never written in place, so the
+        # arrays stay valid for as long as the same frame is passed in
+        frame, arrays = self._ohlc
+        if frame is not df:
+            arrays = tuple(df[col].to_numpy() for col in ('open', 'high', 'low', 'close'))
+            self._ohlc = (df, arrays)
+        return arrays
     
     def calculate_swings(self, df, window=5):
         """Calculate swing highs and lows"""
-        df['swing_high'] = False
-        df['swing_low'] = False
-        
-        for i in range(window, len(df) - window):
-            # Check for swing high
-            if all(df['high'].iloc[i] > df['high'].iloc[i-j] for j in range(1, window+1)) and \
-               all(df['high'].iloc[i] > df['high'].iloc[i+j] for j in range(1, window+1)):
-                df.at[df.index[i], 'swing_high'] = True
-            
-            # Check for swing low
-            if all(df['low'].iloc[i] < df['low'].iloc[i-j] for j in range(1, window+1)) and \
-               all(df['low'].iloc[i] < df['low'].iloc[i+j] for j in range(1, window+1)):
-                df.at[df.index[i], 'swing_low'] = True
+        # Only the HTF frame is swing-scanned; the tracker reuses the swings
+        # of candles that have not changed since the last update
+        if self._htf_swings.window != window:
+            self._htf_swings = SwingTracker(window)
+        df['swing_high'], df['swing_low'] = self._htf_swings.update(
+            df['timestamp'].to_numpy(), df['high'].to_numpy(dtype=np.float64),
+            df['low'].to_numpy(dtype=np.float64))
         
     def determine_market_structure(self, df):
         """Determine market structure as bullish or bearish"""
-        # Get last 4 swing points
-        recent_swings = pd.DataFrame()
-        
-        # Extract swing highs
-        swing_highs = df[df['swing_high'] == True].copy()
-        swing_highs['type'] = 'high'
-        swing_highs['value'] = swing_highs['high']
-        
-        # Extract swing lows
-        swing_lows = df[df['swing_low'] == True].copy()
-        swing_lows['type'] = 'low'
-        swing_lows['value'] = swing_lows['low']
-        
-        # Combine and sort
-        swings = pd.concat([swing_highs, swing_lows])
-        swings = swings.sort_index().tail(4)
-        
-        if len(swings) < 4:
-            # Not enough swing points, use SMA slope as fallback
-            sma50 = df['close'].rolling(50).mean()
-            sma20 = df['close'].rolling(20).mean()
-            
-            if sma20.iloc[-1] > sma50.iloc[-1] and sma20.iloc[-1] > sma20.iloc[-2]:
-                return 'bullish'
-            elif sma20.iloc[-1] < sma50.iloc[-1] and sma20.iloc[-1] < sma20.iloc[-2]:
-                return 'bearish'
-            else:
-                return 'neutral'
-        
-        # Check if we have higher highs and higher lows (bullish)
-        if swings['type'].iloc[-2] == 'high' and swings['type'].iloc[-4] == 'high':
-            if swings['value'].iloc[-2] > swings['value'].iloc[-4]:
-                return 'bullish'
-        
-        # Check if we have lower lows and lower highs (bearish)
-        if swings['type'].iloc[-2] == 'low' and swings['type'].iloc[-4] == 'low':
-            if swings['value'].iloc[-2] < swings['value'].iloc[-4]:
-                return 'bearish'
-        
-        # Default to neutral
-        return 'neutral'
+        return market_structure(df['high'].to_numpy(), df['low'].to_numpy(), df['close'].to_numpy(),
+                                df['swing_high'].to_numpy(), df['swing_low'].to_numpy())
     
     def process_ltf_data(self):
         """Process lower timeframe data for entries"""
@@ -179,20 +159,17 @@ class ICTTraderClient(BinanceClient):
     
     def detect_liquidity_sweeps(self, df):
         """Detect liquidity sweeps of recent swing points"""
-        # Look at the last 5 candles
-        recent_candles = df.tail(5)
-        
         # Find recent swing lows and highs
         lookback = 20
         if len(df) <= lookback:
             return None
             
-        # Find the lowest low and highest high in the lookback period (excluding last 5 candles)
-        recent_low = df['low'].iloc[-lookback:-5].min()
-        recent_high = df['high'].iloc[-lookback:-5].max()
+        # Compare the last 5 candles with the lowest low and highest high of
+        # the lookback period before them
+        bullish, recent_low, bearish, recent_high = liquidity_sweeps(*self.ohlc(df), lookback)
         
         # Check if recent candles have swept below the swing low and then reversed
-        if any(recent_candles['low'] < recent_low * 0.999) and recent_candles['close'].iloc[-1] > recent_candles['open'].iloc[-1]:
+        if bullish:
             # Bullish sweep (swept lows then reversed up)
             if self.htf_bias == 'bullish':  # Only consider sweeps in the direction of HTF bias
                 print(f"Detected Bullish Liquidity Sweep: Swept low at {recent_low}")
@@ -205,7 +182,7 @@ class ICTTraderClient(BinanceClient):
                 return self.last_liquidity_sweep
         
         # Check if recent candles have swept above the swing high and then reversed
-        if any(recent_candles['high'] > recent_high * 1.001) and recent_candles['close'].iloc[-1] < recent_candles['open'].iloc[-1]:
+        if bearish:
             # Bearish sweep (swept highs then reversed down)
             if self.htf_bias == 'bearish':  # Only consider sweeps in the direction of HTF bias
                 print(f"Detected Bearish Liquidity Sweep: Swept high at {recent_high}")
@@ -231,189 +208,120 @@ class ICTTraderClient(BinanceClient):
         if len(df) < sweep_idx + 3:
             return
             
-        # Check for bullish FVG (Candle 3's low is above Candle 1's high)
-        if self.last_liquidity_sweep['type'] == 'bullish':
-            # Get candles involved in potential FVG
-            candle1_idx = sweep_idx
-            candle2_idx = sweep_idx + 1  # Displacement candle
-            candle3_idx = sweep_idx + 2
-            
-            candle1 = df.iloc[candle1_idx]
-            candle2 = df.iloc[candle2_idx]
-            candle3 = df.iloc[candle3_idx]
-            
-            # Check if candle 2 is a strong bullish candle
-            is_bullish_displacement = (candle2['close'] > candle2['open'] and 
-                                    (candle2['close'] - candle2['open']) / candle2['open'] > 0.001)
-            
-            # Check if there's a gap between candle 1 high and candle 3 low
-            if is_bullish_displacement and candle3['low'] > candle1['high']:
-                fvg_size = (candle3['low'] - candle1['high']) / candle1['high']
-                
-                # Only consider significant FVGs
-                if fvg_size >= self.min_fvg_size:
-                    fvg = {
-                        'type': 'bullish',
-                        'top': candle3['low'],
-                        'bottom': candle1['high'],
-                        'mid': (candle3['low'] + candle1['high']) / 2,
-                        'size': fvg_size,
-                        'age': 0,
-                        'created_at': df.index[candle3_idx],
-                        'filled': False
-                    }
-                    
-                    self.active_fvgs.append(fvg)
-                    print(f"Detected Bullish FVG: {fvg['bottom']} to {fvg['top']}, size: {fvg['size']*100:.2f}%")
+        # Scan every 3-candle window from the sweep candle on: candle 1, the
+        # displacement candle 2 and candle 3 whose wick leaves the gap
+        bullish = self.last_liquidity_sweep['type'] == 'bullish'
+        start, top, bottom, fvg_size = fair_value_gaps(
+            *(a[sweep_idx:] for a in self.ohlc(df)), bullish)
+        # Keyed on candle open time, which stays put when newer candles arrive
+        created_at = df['timestamp'].to_numpy()[sweep_idx + start + 2]
+        
+        # Only consider significant FVGs that are not tracked yet
+        new = (fvg_size >= self.min_fvg_size) & np.array([t not in self.active_fvgs for t in created_at], dtype=bool)
+        if not new.any():
+            return
         
-        # Check for bearish FVG (Candle 3's high is below Candle 1's low)
-        elif self.last_liquidity_sweep['type'] == 'bearish':
-            # Get candles involved in potential FVG
-            candle1_idx = sweep_idx
-            candle2_idx = sweep_idx + 1  # Displacement candle
-            candle3_idx = sweep_idx + 2
-            
-            candle1 = df.iloc[candle1_idx]
-            candle2 = df.iloc[candle2_idx]
-            candle3 = df.iloc[candle3_idx]
-            
-            # Check if candle 2 is a strong bearish candle
-            is_bearish_displacement = (candle2['close'] < candle2['open'] and 
-                                     (candle2['open'] - candle2['close']) / candle2['open'] > 0.001)
-            
-            # Check if there's a gap between candle 1 low and candle 3 high
-            if is_bearish_displacement and candle3['high'] < candle1['low']:
-                fvg_size = (candle1['low'] - candle3['high']) / candle1['low']
-                
-                # Only consider significant FVGs
-                if fvg_size >= self.min_fvg_size:
-                    fvg = {
-                        'type': 'bearish',
-                        'top': candle1['low'],
-                        'bottom': candle3['high'],
-                        'mid': (candle1['low'] + candle3['high']) / 2,
-                        'size': fvg_size,
-                        'age': 0,
-                        'created_at': df.index[candle3_idx],
-                        'filled': False
-                    }
-                    
-                    self.active_fvgs.append(fvg)
-                    print(f"Detected Bearish FVG: {fvg['top']} to {fvg['bottom']}, size: {fvg['size']*100:.2f}%")
+        self.active_fvgs.extend(bullish, top[new], bottom[new], fvg_size[new], created_at[new])
+        for t, b, s in zip(top[new], bottom[new], fvg_size[new]):
+            if bullish:
+                print(f"Detected Bullish FVG: {b} to {t}, size: {s*100:.2f}%")
+            else:
+                print(f"Detected Bearish FVG: {t} to {b}, size: {s*100:.2f}%")
     
     def update_active_fvgs(self, df):
         """Update active FVGs (remove filled or expired ones)"""
-        if not self.active_fvgs:
+        fvgs = self.active_fvgs
+        if not fvgs:
             return
             
-        latest_price = df['close'].iloc[-1]
-        updated_fvgs = []
-        
-        for fvg in self.active_fvgs:
-            # Increment age
-            fvg['age'] += 1
-            
-            # Check if FVG has been filled
-            if fvg['type'] == 'bullish':
-                # A bullish FVG is filled if price drops below the middle of the gap
-                if df['low'].iloc[-1] <= fvg['mid']:
-                    fvg['filled'] = True
-                    print(f"Bullish FVG from {fvg['created_at']} has been filled")
-            else:
-                # A bearish FVG is filled if price rises above the middle of the gap
-                if df['high'].iloc[-1] >= fvg['mid']:
-                    fvg['filled'] = True
-                    print(f"Bearish FVG from {fvg['created_at']} has been filled")
-            
-            # Keep FVG if it's not too old and not filled
-            if fvg['age'] <= self.max_fvg_age and not fvg['filled']:
-                updated_fvgs.append(fvg)
-        
-        self.active_fvgs = updated_fvgs
+        # Increment age
+        fvgs.age += 1
+        
+        # A bullish FVG is filled if price drops below the middle of the gap,
+        # a bearish FVG if price rises above it
+        _, high, low, _ = self.ohlc(df)
+        filled = np.where(fvgs.is_bull, low[-1] <= fvgs.mid, high[-1] >= fvgs.mid)
+        for i in np.flatnonzero(filled):
+            kind = 'Bullish' if fvgs.is_bull[i] else 'Bearish'
+            print(f"{kind} FVG from {fvgs.created_at[i]} has been filled")
+        
+        # Keep FVGs that are not too old and not filled
+        fvgs.keep((fvgs.age <= self.max_fvg_age) & ~filled)
     
     def check_fvg_retests(self, df):
         """Check for retests of active FVGs to generate entry signals"""
-        if not self.active_fvgs or self.position_open:
+        fvgs = self.active_fvgs
+        if not fvgs or self.position_open:
             return
             
-        latest_candle = df.iloc[-1]
-        latest_price = latest_candle['close']
+        _, high, low, close = self.ohlc(df)
+        latest_price = close[-1]
         
-        for fvg in self.active_fvgs:
-            # Check if price is retesting the FVG
-            if fvg['type'] == 'bullish':
-                # For bullish FVG, we enter when price pulls back to the FVG area
-                if latest_candle['low'] <= fvg['top'] and latest_candle['high'] >= fvg['bottom']:
-                    # Price is within FVG range, trigger entry
-                    entry_price = latest_price
-                    stop_loss = self.last_liquidity_sweep['price'] * 0.998  # Just below sweep low
-                    
-                    # Calculate take profit based on risk-reward
-                    risk = entry_price - stop_loss
-                    take_profit = entry_price + (risk * self.risk_reward_ratio)
-                    
-                    print(f"Bullish FVG Retest Triggered: Entry: {entry_price}, SL: {stop_loss}, TP: {take_profit}")
-                    
-                    # Place order
-                    self.buy()
-                    
-                    # Set custom stop loss and take profit
-                    self.tp = [take_profit]
-                    self.tp_ratio = [1.0]
-                    self.trail_stop_enabled = True
-                    self.trail_stop = 0.8  # Keep 80% of profits
-                    
-                    # Remove this FVG from active list
-                    self.active_fvgs.remove(fvg)
-                    return
-                    
-            elif fvg['type'] == 'bearish':
-                # For bearish FVG, we enter when price pulls back to the FVG area
-                if latest_candle['high'] >= fvg['bottom'] and latest_candle['low'] <= fvg['top']:
-                    # Price is within FVG range, trigger entry
-                    entry_price = latest_price
-                    stop_loss = self.last_liquidity_sweep['price'] * 1.002  # Just above sweep high
-                    
-                    # Calculate take profit based on risk-reward
-                    risk = stop_loss - entry_price
-                    take_profit = entry_price - (risk * self.risk_reward_ratio)
-                    
-                    print(f"Bearish FVG Retest Triggered: Entry: {entry_price}, SL: {stop_loss}, TP: {take_profit}")
-                    
-                    # Place order
-                    self.sell()
-                    
-                    # Set custom stop loss and take profit
-                    self.tp = [take_profit]
-                    self.tp_ratio = [1.0]
-                    self.trail_stop_enabled = True
-                    self.trail_stop = 0.8  # Keep 80% of profits
-                    
-                    # Remove this FVG from active list
-                    self.active_fvgs.remove(fvg)
-                    return
+        # Price is retesting an FVG when the latest candle overlaps the gap;
+        # the oldest retested FVG triggers the entry
+        retested = np.flatnonzero((low[-1] <= fvgs.top) & (high[-1] >= fvgs.bottom))
+        if len(retested) == 0:
+            return
+        i = retested[0]
+        entry_price = latest_price
+        
+        if fvgs.is_bull[i]:
+            # For bullish FVG, we enter when price pulls back to the FVG area
+            stop_loss = self.last_liquidity_sweep['price'] * 0.998  # Just below sweep low
+            
+            # Calculate take profit based on risk-reward
+            risk = entry_price - stop_loss
+            take_profit = entry_price + (risk * self.risk_reward_ratio)
+            
+            print(f"Bullish FVG Retest Triggered: Entry: {entry_price}, SL: {stop_loss}, TP: {take_profit}")
+            
+            # Place order
+            self.buy()
+        else:
+            # For bearish FVG, we enter when price pulls back to the FVG area
+            stop_loss = self.last_liquidity_sweep['price'] * 1.002  # Just above sweep high
+            
+            # Calculate take profit based on risk-reward
+            risk = stop_loss - entry_price
+            take_profit = entry_price - (risk * self.risk_reward_ratio)
+            
+            print(f"Bearish FVG Retest Triggered: Entry: {entry_price}, SL: {stop_loss}, TP: {take_profit}")
+            
+            # Place order
+            self.sell()
+        
+        # Set custom stop loss and take profit
+        self.tp = [take_profit]
+        self.tp_ratio = [1.0]
+        self.trail_stop_enabled = True
+        self.trail_stop = 0.8  # Keep 80% of profits
+        
+        # Remove this FVG from active list
+        fvgs.remove(i)
     
     def manager(self):
         """Main manager method to handle trading decisions"""
-        # Check for trail stop conditions first
-        ts = self.update_trailstop(self.df.iloc[-1])
-        if ts:
-            return 1
+        # Check for trail stop conditions first; the trail stop only acts
+        # on an open position and reads the last close, high and low
+        if self.position_open and self.trail_stop_enabled:
+            _, high, low, close = self.ohlc(self.df)
+            if self.update_trailstop({'close': close[-1], 'high': high[-1], 'low': low[-1]}):
+                return 1
             
         # No need to do anything if the strategy is off
         if self.htf_bias == 'neutral':
-            print("Market structure is neutral, no new trades")
+            logger.info("Market structure is neutral, no new trades")
             return 0
             
-        # Check for FVG retests to generate entry signals
-        self.check_fvg_retests(self.ltf_df)
-        
+        # FVG retests on the latest candles were already checked by data_process
         return 0
 
 
 # Main execution code when run directly
 if __name__ == "__main__":
     with LoggingPrinter():
+        # Route the module's log records through the same console/file tee as print()
+        logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
         trader = ICTTraderClient(key.key, key.secret)
 
         trader.trade_history = []
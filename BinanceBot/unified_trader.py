@@ -14,12 +14,15 @@ import datetime
 import argparse
 import logging
 import threading
+import functools
+import heapq
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import key
 from trade import ICTTraderClient
 from BinanceClient import BinanceClient
-from dashboard import app, update_bot_status, update_pair_status, bot_status, pair_status, add_trade
+from dashboard import app, update_bot_status, update_pair_status, bot_status, pair_status, add_trade, enable_fast_json
 
 # Create necessary directories
 os.makedirs('logs', exist_ok=True)
@@ -40,8 +43,28 @@ logger = logging.getLogger(__name__)
 # Dictionary to store all trader instances
 traders = {}
 
-# Lock for thread safety when updating shared data
-trader_lock = threading.Lock()
+# One lock per pair, held while that pair's trader is updated or read, so
+# pair threads never wait on each other
+pair_locks = {}
+
+# Held only to add or remove entries in traders/pair_locks
+registry_lock = threading.Lock()
+
+# Held only while recombining the totals pushed to the dashboard
+status_lock = threading.Lock()
+
+# Set once on shutdown; stops the tick scheduler and any pending ticks
+shutdown_event = threading.Event()
+
+# Pending ticks as a (due_time, pair) heap, so the soonest-due pair runs first
+tick_queue = []
+tick_ready = threading.Condition()
+
+# Seconds between ticks while a position is open (stops track the live price)
+POLL_INTERVAL = 1
+
+# Seconds per Binance kline interval unit, for aligning ticks to candle closes
+INTERVAL_UNITS = {'m': 60, 'h': 3600, 'd': 86400}
 
 def setup_logging():
     """Configure logging for the bot"""
@@ -78,96 +101,99 @@ def parse_arguments():
     
     return parser.parse_args()
 
-def bot_status_updater(update_interval=5):
-    """Thread function to update the dashboard with bot status for all pairs"""
-    global bot_status, pair_status
+def next_candle_seconds(interval):
+    """Seconds until the next close of an interval such as '5m' or '1h'"""
+    unit = INTERVAL_UNITS.get(interval[-1:])
+    if unit is None or not interval[:-1].isdigit():
+        return POLL_INTERVAL
+    period = int(interval[:-1]) * unit
+    # Wake just after the close so the finished candle is available
+    return period - time.time() % period + 1
+
+def next_tick_delay(trader, interval):
+    """How long a trader can wait before its next tick"""
+    if getattr(trader, 'position_open', False):
+        return POLL_INTERVAL
+    return next_candle_seconds(interval)
+
+# Last published (trader_data, totals) per pair; a tick that leaves it
+# unchanged is not pushed to the dashboard
+published_state = {}
+
+def trader_state(pair, trader):
+    """Collect a trader's dashboard fields and its contribution to the totals"""
+    trader_data = dict(pair_status.get(pair, {}))
+    # Every field read here is initialized by create_*_trader, so no hasattr checks
+    trades = trader.total_trades
+    win_trades = trader.win_trades
+    active = int(trader.position_open)
     
-    while True:
-        try:
-            # Collect status information from all traders
-            combined_status = {
-                'is_running': True,
-                'strategy': bot_status['strategy'],
-                'pairs': [],
-                'total_value': 0,
-                'total_trades': 0,
-                'win_trades': 0,
-                'active_positions': 0,
-                'last_update': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            }
-            
-            with trader_lock:
-                # Process each trader's status
-                for pair, trader in traders.items():
-                    combined_status['pairs'].append(pair)
-                    
-                    # Get trader-specific data
-                    trader_data = pair_status.get(pair, {})
-                    
-                    # Update position status
-                    if hasattr(trader, 'position_open'):
-                        trader_data['position_open'] = trader.position_open
-                        if trader.position_open:
-                            combined_status['active_positions'] += 1
-                    
-                    # Update trade count and win rate
-                    if hasattr(trader, 'trade_history') and trader.trade_history:
-                        trades = len(trader.trade_history)
-                        win_trades = sum(1 for trade in trader.trade_history if trade.get('profit', 0) > 0)
-                        win_rate = (win_trades / trades * 100) if trades > 0 else 0
-                        
-                        trader_data['total_trades'] = trades
-                        trader_data['win_rate'] = round(win_rate, 1)
-                        
-                        combined_status['total_trades'] += trades
-                        combined_status['win_trades'] += win_trades
-                    
-                    # Update market structure info for ICT strategy
-                    if hasattr(trader, 'market_bias'):
-                        trader_data['market_bias'] = trader.market_bias
-                    
-                    # Update FVG info for ICT strategy
-                    if hasattr(trader, 'bull_fvgs') and hasattr(trader, 'bear_fvgs'):
-                        trader_data['active_fvgs'] = len(trader.bull_fvgs) + len(trader.bear_fvgs)
-                    
-                    # Update balances and price
-                    if hasattr(trader, 'balances'):
-                        base_asset = trader.base_asset if hasattr(trader, 'base_asset') else 'BUSD'
-                        asset = trader.asset if hasattr(trader, 'asset') else pair.replace(base_asset, '')
-                        
-                        trader_data['base_balance'] = trader.balances.get(base_asset, 0)
-                        trader_data['asset_balance'] = trader.balances.get(asset, 0)
-                        
-                        # Get current price
-                        if hasattr(trader, 'asset_price') and trader.asset_price:
-                            trader_data['current_price'] = trader.asset_price
-                        
-                        # Calculate total value
-                        total_value = trader_data.get('base_balance', 0)
-                        if trader_data.get('asset_balance') and trader_data.get('current_price'):
-                            total_value += trader_data['asset_balance'] * trader_data['current_price']
-                        
-                        trader_data['total_value'] = total_value
-                        combined_status['total_value'] += total_value
-                    
-                    # Update pair status
-                    pair_status[pair] = trader_data
-            
-            # Calculate overall win rate
-            if combined_status['total_trades'] > 0:
-                combined_status['win_rate'] = round(combined_status['win_trades'] / combined_status['total_trades'] * 100, 1)
-            else:
-                combined_status['win_rate'] = 0
-            
-            # Update the dashboard
-            update_bot_status(combined_status)
-            
-            # Sleep for the update interval
-            time.sleep(update_interval)
+    # Update position status
+    trader_data['position_open'] = trader.position_open
+    
+    # Update trade count and win rate from the trader's running counters
+    if trades:
+        trader_data['total_trades'] = trades
+        trader_data['win_rate'] = round(win_trades / trades * 100, 1)
+    
+    # Update market structure and FVG info (unset for the Original strategy)
+    trader_data['market_bias'] = trader.htf_bias
+    trader_data['active_fvgs'] = len(trader.active_fvgs)
+    
+    # Update balances and price
+    trader_data['base_balance'] = trader.balances.get(trader.base_asset, 0)
+    trader_data['asset_balance'] = trader.balances.get(trader.asset, 0)
+    
+    # Get current price
+    if trader.asset_price:
+        trader_data['current_price'] = trader.asset_price
+    
+    # Calculate total value
+    total_value = trader_data['base_balance']
+    if trader_data['asset_balance'] and trader_data.get('current_price'):
+        total_value += trader_data['asset_balance'] * trader_data['current_price']
+    
+    trader_data['total_value'] = total_value
+    
+    return trader_data, (total_value, trades, win_trades, active)
+
+def publish_trader_state(pair, trader):
+    """Push a trader's status to the dashboard if it changed since its last tick"""
+    # Rebound (never mutated) by the trader's own thread, so no lock is needed
+    state = trader.status_snapshot
+    if state is None or published_state.get(pair) == state:
+        return
+    
+    with status_lock:
+        published_state[pair] = state
+        pair_status[pair] = state[0]
+        
+        # Recombine the totals from the last published state of every pair
+        total_value = total_trades = win_trades = active_positions = 0
+        for _, (value, trades, wins, active) in published_state.values():
+            total_value += value
+            total_trades += trades
+            win_trades += wins
+            active_positions += active
         
-        except Exception as e:
-            logger.error(f"Error in bot status updater: {e}", exc_info=True)
-            time.sleep(update_interval)
+        update_bot_status({
+            'pairs': list(traders),
+            'total_value': total_value,
+            'total_trades': total_trades,
+            'win_trades': win_trades,
+            'win_rate': round(win_trades / total_trades * 100, 1) if total_trades else 0,
+            'active_positions': active_positions,
+            'last_update': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        })
+
+@functools.lru_cache(maxsize=None)
+def split_pair(pair):
+    """Split a pair such as BTCBUSD into (base_asset, asset)"""
+    if 'BUSD' in pair:
+        return 'BUSD', pair.replace('BUSD', '')
+    if 'USDT' in pair:
+        return 'USDT', pair.replace('USDT', '')
+    return 'USDT', pair  # Default
 
 def create_trader(strategy, pair, args):
     """Create a trader instance based on the specified strategy"""
@@ -183,15 +209,7 @@ def create_ict_trader(pair, args):
         trader = ICTTraderClient(key.key, key.secret)
         
         # Parse the base asset and trading asset from the pair
-        if 'BUSD' in pair:
-            base_asset = 'BUSD'
-            asset = pair.replace('BUSD', '')
-        elif 'USDT' in pair:
-            base_asset = 'USDT'
-            asset = pair.replace('USDT', '')
-        else:
-            base_asset = 'USDT'  # Default
-            asset = pair.split('USDT')[0] if 'USDT' in pair else pair
+        base_asset, asset = split_pair(pair)
         
         # Set up basic parameters
         trader.trade_history = []
@@ -228,15 +246,7 @@ def create_original_trader(pair, args):
         trader = BinanceClient(key.key, key.secret)
         
         # Parse the base asset and trading asset from the pair
-        if 'BUSD' in pair:
-            base_asset = 'BUSD'
-            asset = pair.replace('BUSD', '')
-        elif 'USDT' in pair:
-            base_asset = 'USDT'
-            asset = pair.replace('USDT', '')
-        else:
-            base_asset = 'USDT'  # Default
-            asset = pair.split('USDT')[0] if 'USDT' in pair else pair
+        base_asset, asset = split_pair(pair)
         
         # Set up basic parameters
         trader.trade_history = []
@@ -246,6 +256,10 @@ def create_original_trader(pair, args):
         trader.interval = args.ltf
         trader.df_length = 100
         
+        # No market structure or FVG tracking in this strategy
+        trader.htf_bias = None
+        trader.active_fvgs = ()
+        
         # Set risk parameters
         trader.risk_per_trade = args.risk
         trader.trail_stop = args.trail
@@ -284,10 +298,8 @@ def initialize_trader(trader, pair):
         logger.error(f"Error initializing trader for {pair}: {e}", exc_info=True)
         return False
 
-def run_trader(pair, args):
-    """Run a trader instance for a specific pair"""
-    global traders
-    
+def start_trader(pair, args):
+    """Create, initialize and register the trader for a pair, then queue its first tick"""
     try:
         # Create the trader based on the selected strategy
         trader = create_trader(args.strategy, pair, args)
@@ -301,49 +313,93 @@ def run_trader(pair, args):
             logger.error(f"Failed to initialize trader for {pair}, skipping")
             return
         
-        # Store the trader instance
-        with trader_lock:
+        # Store the trader instance and give it its own lock
+        trader.status_snapshot = None
+        with registry_lock:
+            pair_locks[pair] = threading.Lock()
             traders[pair] = trader
         
         # Start trading
         logger.info(f"Starting trading process for {pair}")
+        schedule_tick(pair, 0)
+    
+    except Exception as e:
+        logger.error(f"Fatal error starting trader for {pair}: {e}", exc_info=True)
+
+def trade_tick(pair, trader, args):
+    """Run one trading iteration for a pair and return the seconds until its next one"""
+    try:
+        # Skip if bot has been stopped or is shutting down
+        if shutdown_event.is_set() or not bot_status['is_running']:
+            return POLL_INTERVAL
         
-        # Main trading loop
-        while bot_status['is_running']:
-            try:
-                # Skip if bot has been temporarily stopped
-                if not bot_status['is_running']:
-                    time.sleep(1)
-                    continue
-                
-                # Update market data
-                trader.update()
-                
-                # Run trading logic based on strategy
-                if args.strategy == 'ICT':
-                    # Call manager method for ICT strategy
-                    if hasattr(trader, 'manager'):
-                        trader.manager()
-                else:
-                    # Original strategy trading logic
-                    # Implement appropriate trading decision method here
-                    pass
-                
-                # Sleep to avoid API rate limits
-                time.sleep(1)
-                
-            except Exception as e:
-                logger.error(f"Error in trading loop for {pair}: {e}", exc_info=True)
-                time.sleep(5)  # Wait longer on error
+        with pair_locks[pair]:
+            # Update market data
+            trader.update()
+            
+            # Run trading logic based on strategy
+            if args.strategy == 'ICT':
+                # Call manager method for ICT strategy
+                if hasattr(trader, 'manager'):
+                    trader.manager()
+            else:
+                # Original strategy trading logic
+                # Implement appropriate trading decision method here
+                pass
+            
+            # Snapshot the state this tick left behind for the publisher
+            trader.status_snapshot = trader_state(pair, trader)
+        
+        # Push the new state to the dashboard if the tick changed it
+        publish_trader_state(pair, trader)
         
-        logger.info(f"Trading process stopped for {pair}")
+        # Wait for the next candle (or price poll)
+        return next_tick_delay(trader, args.ltf)
     
     except Exception as e:
-        logger.error(f"Fatal error in trader thread for {pair}: {e}", exc_info=True)
+        logger.error("Error in trading loop for %s: %s", pair, e, exc_info=True)
+        return 5  # Wait longer on error
+
+def schedule_tick(pair, delay):
+    """Queue a pair's next tick to run after delay seconds"""
+    if shutdown_event.is_set():
+        return
+    with tick_ready:
+        heapq.heappush(tick_queue, (time.monotonic() + delay, pair))
+        tick_ready.notify()
+
+def run_scheduler(args, pool):
+    """Hand due ticks to the worker pool until shutdown"""
+    while not shutdown_event.is_set():
+        with tick_ready:
+            if not tick_queue:
+                tick_ready.wait()
+                continue
+            due, pair = tick_queue[0]
+            delay = due - time.monotonic()
+            if delay > 0:
+                # Woken early by a sooner tick or by shutdown
+                tick_ready.wait(delay)
+                continue
+            heapq.heappop(tick_queue)
+        
+        # Shutdown may have begun (and closed the pool) while this tick was due
+        if shutdown_event.is_set():
+            break
+        try:
+            future = pool.submit(trade_tick, pair, traders[pair], args)
+        except RuntimeError:
+            break  # pool already shut down
+        
+        # A pair is requeued only once its tick finishes, so it never runs twice at once
+        future.add_done_callback(lambda done, pair=pair: schedule_tick(pair, done.result()))
+    
+    logger.info("Trading scheduler stopped")
 
 def run_dashboard(args):
     """Run the dashboard in a separate thread"""
     logger.info(f"Starting web dashboard on port {args.port}")
+    enable_fast_json(app)
     app.run(host='0.0.0.0', port=args.port, debug=args.debug)
 
 def main():
@@ -359,9 +415,6 @@ def main():
         'last_update': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     })
     
-    # Start status updater thread
-    threading.Thread(target=bot_status_updater, daemon=True).start()
-    
     # Start dashboard thread
     dashboard_thread = threading.Thread(target=run_dashboard, args=(args,), daemon=True)
     dashboard_thread.start()
@@ -369,27 +422,32 @@ def main():
     # Give the dashboard time to start
     time.sleep(2)
     
-    # Start individual trader threads
-    trader_threads = []
-    for pair in [pair.strip() for pair in args.pairs.split(',')]:
-        thread = threading.Thread(target=run_trader, args=(pair, args), daemon=True)
-        thread.start()
-        trader_threads.append(thread)
+    # Trader ticks run on a bounded pool rather than one thread per pair
+    pairs = [pair.strip() for pair in args.pairs.split(',')]
+    workers = min(len(pairs), (os.cpu_count() or 1) * 2)
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='trader')
+    threading.Thread(target=run_scheduler, args=(args, pool), daemon=True).start()
+    
+    for pair in pairs:
+        pool.submit(start_trader, pair, args)
         
         # Small delay between starting traders to avoid rate limits
         time.sleep(0.5)
     
-    logger.info(f"Started {len(trader_threads)} trader threads")
+    logger.info(f"Started {len(pairs)} traders on {workers} worker threads")
     print(f"Dashboard available at: http://localhost:{args.port}/")
     
     try:
-        # Keep main thread alive
-        while True:
-            time.sleep(1)
+        # Keep main thread alive until shutdown
+        shutdown_event.wait()
     except KeyboardInterrupt:
         logger.info("Received keyboard interrupt, shutting down...")
+        shutdown_event.set()
+        with tick_ready:
+            tick_ready.notify_all()
         update_bot_status({'is_running': False})
-        time.sleep(2)  # Give threads time to cleanly exit
+        # Let ticks already running finish cleanly
+        pool.shutdown(wait=True)
         logger.info("Shutdown complete")
 
 if __name__ == "__main__":
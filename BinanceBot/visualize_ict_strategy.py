@@ -6,9 +6,16 @@ This script allows you to visualize the ICT strategy setups and market structure
 It connects to Binance, fetches market data, and visualizes it using the ICTVisualizer.
 """
 
+import sys
+import matplotlib
+
+# Charts that are only saved don't need a GUI backend; select Agg before
+# anything below imports pyplot
+if '--save' in sys.argv:
+    matplotlib.use('Agg')
+
 import key
 import time
-import sys
 from ict_strategy import ICTStrategyClient
 from ict_visualization import ICTVisualizer
 import matplotlib.pyplot as plt